@@ -1,104 +1,798 @@
 """ Nature Remo Module """
+import asyncio
+import contextlib
+import hashlib
 import logging
-from datetime import timedelta
+import random
+import time
+from datetime import datetime, timedelta
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+import aiohttp
 from homeassistant import config_entries, core
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.const import (CONF_ACCESS_TOKEN, CONF_DEVICES, CONF_ENTITIES)
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
+from homeassistant.const import (
+    CONF_ACCESS_TOKEN, CONF_DEVICE_ID, CONF_DEVICES, CONF_ENTITIES, CONF_HOST,
+    CONF_SCAN_INTERVAL, EVENT_HOMEASSISTANT_CLOSE
+)
 
-from .const import (DOMAIN, BASE_URL, COORDINATOR)
+from .const import (
+    DOMAIN, BASE_URL, COORDINATOR, CONF_APPLIANCES_INTERVAL, CONF_REFRESH_COOLDOWN,
+    CONF_LOG_PAYLOADS,
+    CONF_MIN_INTERVAL, CONF_MAX_INTERVAL, BOOST_DURATION,
+    APPLIANCE_AC, APPLIANCE_LIGHT, APPLIANCE_TV,
+    DEFAULT_SCAN_INTERVAL, DEFAULT_APPLIANCES_INTERVAL, DEFAULT_REFRESH_COOLDOWN,
+    DEFAULT_MIN_INTERVAL, DEFAULT_MAX_INTERVAL,
+    STORAGE_VERSION, STORAGE_SAVE_DELAY, ATTR_SAVED_AT,
+    REQUEST_TIMEOUT, REQUEST_RETRIES, RETRY_BACKOFF, MAX_RESPONSE_SIZE
+)
+from .circuit import (NatureRemoCircuitBreaker, STATE_HALF_OPEN)
+from .client import (NatureRemoConnectionStats, async_create_session, auth_headers)
+from .local import (NatureRemoLocalApi, NatureRemoLocalApiError)
+from .metrics import (NatureRemoMetrics, endpoint_name)
+from .models import (Appliance, decode_appliances)
+from .rate_limit import (NatureRemoRateLimiter, PRIORITY_COMMAND, PRIORITY_POLL)
+from .scheduler import NatureRemoPollScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
 
+PLATFORMS = ["sensor", "climate", "button", "light", "media_player"]
+
+# Platform of the main entity of each appliance type
+APPLIANCE_PLATFORMS = {
+    APPLIANCE_AC: "climate",
+    APPLIANCE_LIGHT: "light",
+    APPLIANCE_TV: "media_player",
+}
+
+
+async def async_setup(hass: core.HomeAssistant, config: Dict[str, Any]) -> bool:
+    """ Register the integration services """
+    # Imported here as the services module imports this one
+    from .services import async_setup_services  # pylint: disable=import-outside-toplevel
+
+    async_setup_services(hass)
+    return True
+
+
 async def async_setup_entry(hass: core.HomeAssistant, entry: config_entries.ConfigEntry) -> bool:
     """ Setup platform from a ConfigEntry """
 
-    hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = entry.data
+    registry = async_get_registry(hass)
+    coordinator = registry.async_acquire(entry)
+
+    try:
+        await coordinator.async_first_refresh()
+    except ConfigEntryNotReady:
+        await registry.async_release(entry)
+        raise
+
+    entry.async_on_unload(entry.add_update_listener(_async_update_options))
 
-    session = async_get_clientsession(hass)
-    api = NatureRemoApi(BASE_URL, entry.data[CONF_ACCESS_TOKEN], session)
-    hass.data[DOMAIN][COORDINATOR] = NatureRemoApiCoordinator(hass, api)
+    # Only platforms with entities for this device are loaded
+    device_id = entry.data[CONF_DEVICE_ID]
+    platforms = coordinator.platforms(device_id)
+    if not platforms:
+        _LOGGER.warning("Device %s not found in Nature Remo account", device_id)
+    registry.platforms[entry.entry_id] = platforms
 
     await hass.async_create_task(
-        hass.config_entries.async_forward_entry_setups(entry, ["sensor", "climate"])
+        hass.config_entries.async_forward_entry_setups(entry, platforms)
     )
 
     return True
 
 
+async def async_unload_entry(hass: core.HomeAssistant, entry: config_entries.ConfigEntry) -> bool:
+    """ Unload a ConfigEntry and release its coordinator """
+
+    registry = async_get_registry(hass)
+    platforms = registry.platforms.get(entry.entry_id, PLATFORMS)
+    unloaded = await hass.config_entries.async_unload_platforms(entry, platforms)
+
+    if unloaded:
+        registry.platforms.pop(entry.entry_id, None)
+        await registry.async_release(entry)
+
+    return unloaded
+
+
+async def async_remove_entry(hass: core.HomeAssistant, entry: config_entries.ConfigEntry) -> None:
+    """ Remove the snapshot cache and learned messages once no entry uses the token """
+    token = entry.data[CONF_ACCESS_TOKEN]
+    for other in hass.config_entries.async_entries(DOMAIN):
+        if other.entry_id != entry.entry_id and other.data.get(CONF_ACCESS_TOKEN) == token:
+            return
+    await _snapshot_store(hass, token).async_remove()
+    await _messages_store(hass, token).async_remove()
+
+
+async def async_migrate_entry(hass: core.HomeAssistant, entry: config_entries.ConfigEntry) -> bool:
+    """ Migrate old config entries """
+    _LOGGER.debug("Migrating entry %s from version %s", entry.entry_id, entry.version)
+
+    if entry.version == 1:
+        # Version 1 stored the whole /devices and /appliances responses
+        data = {
+            CONF_ACCESS_TOKEN: entry.data[CONF_ACCESS_TOKEN],
+            CONF_DEVICE_ID: entry.data[CONF_DEVICE_ID],
+        }
+        hass.config_entries.async_update_entry(entry, data=data, version=2)
+
+    return True
+
+
+def _account_key(token: str) -> str:
+    """ Return a stable identifier of the account that does not leak the token """
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+
+def _snapshot_store(hass: core.HomeAssistant, token: str) -> Store:
+    """ Return the store caching the last snapshot of the token account """
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{_account_key(token)}")
+
+
+def _messages_store(hass: core.HomeAssistant, token: str) -> Store:
+    """ Return the store of the raw IR messages learned for the token signals """
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{_account_key(token)}.messages")
+
+
+def _compact_snapshot(data: Dict[str, Any]) -> Dict[str, Any]:
+    """ Return the snapshot without the fields no platform reads """
+    return {
+        ATTR_SAVED_AT: dt_util.utcnow().isoformat(),
+        CONF_DEVICES: data[CONF_DEVICES],
+        CONF_ENTITIES: {
+            appliance_id: appliance.as_dict()
+            for appliance_id, appliance in data[CONF_ENTITIES].items()
+        },
+    }
+
+
+async def _async_update_options(hass: core.HomeAssistant, entry: config_entries.ConfigEntry) -> None:
+    """ Apply changed options to the shared coordinator """
+    registry = async_get_registry(hass)
+    registry.async_apply_options(entry.data[CONF_ACCESS_TOKEN])
+    async_get_coordinator(hass, entry).api.set_local_host(
+        entry.data[CONF_DEVICE_ID], entry.options.get(CONF_HOST)
+    )
+
+
+@core.callback
+def async_get_registry(hass: core.HomeAssistant) -> "NatureRemoCoordinatorRegistry":
+    """ Return the coordinator registry, creating it on first use """
+    data = hass.data.setdefault(DOMAIN, {})
+    if COORDINATOR not in data:
+        data[COORDINATOR] = NatureRemoCoordinatorRegistry(hass)
+    return data[COORDINATOR]
+
+
+@core.callback
+def async_get_coordinator(
+    hass: core.HomeAssistant, entry: config_entries.ConfigEntry
+) -> "NatureRemoApiCoordinator":
+    """ Return the coordinator shared by all entries using the entry token """
+    return async_get_registry(hass).get(entry.data[CONF_ACCESS_TOKEN])
+
+
+class NatureRemoCoordinatorRegistry():
+    """
+    Registry of coordinators keyed by access token.
+    All config entries (one per Remo device) that use the same token share a
+    single coordinator so the account is polled only once per interval. The
+    registry keeps track of which entries hold a reference to each coordinator
+    and shuts the coordinator down when the last entry is unloaded.
+    When entries sharing a coordinator have different options the fastest
+    intervals win.
+    Entries with different tokens (one per account) get their own coordinator
+    and rate limit budget, and their polls are staggered by a shared scheduler.
+    """
+
+    def __init__(self, hass: core.HomeAssistant):
+        self._hass = hass
+        self._scheduler = NatureRemoPollScheduler()
+        self._coordinators: Dict[str, NatureRemoApiCoordinator] = {}
+        self._references: Dict[str, Dict[str, config_entries.ConfigEntry]] = {}
+        # Platforms each entry was forwarded to
+        self.platforms: Dict[str, List[str]] = {}
+        # Cloud session shared by all accounts, closed with the last coordinator
+        # or when Home Assistant stops, which does not unload the entries.
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._cancel_close: Optional[Callable[[], None]] = None
+        self.connections = NatureRemoConnectionStats()
+
+    def get(self, token: str) -> "NatureRemoApiCoordinator":
+        """ Return the coordinator for the token """
+        return self._coordinators[token]
+
+    def find_appliance(
+        self, appliance_id: str
+    ) -> Optional[Tuple["NatureRemoApiCoordinator", Appliance]]:
+        """ Return the appliance and the coordinator of its account """
+        for coordinator in self._coordinators.values():
+            if coordinator.data is None:
+                continue
+            appliance = coordinator.data[CONF_ENTITIES].get(appliance_id)
+            if appliance is not None:
+                return coordinator, appliance
+        return None
+
+    @core.callback
+    def async_acquire(self, entry: config_entries.ConfigEntry) -> "NatureRemoApiCoordinator":
+        """ Return the coordinator for the entry token and take a reference to it """
+        token = entry.data[CONF_ACCESS_TOKEN]
+
+        if token not in self._coordinators:
+            _LOGGER.debug("Creating coordinator for entry %s", entry.entry_id)
+            if self._session is None:
+                self._session = async_create_session(self.connections)
+                self._cancel_close = self._hass.bus.async_listen_once(
+                    EVENT_HOMEASSISTANT_CLOSE, self._async_close_session
+                )
+            api = NatureRemoApi(
+                BASE_URL, token, self._session, self.connections,
+                async_get_clientsession(self._hass),
+            )
+            self._coordinators[token] = NatureRemoApiCoordinator(self._hass, api, self._scheduler)
+            self._scheduler.add(_account_key(token))
+            self._references[token] = {}
+
+        self._references[token][entry.entry_id] = entry
+        self.async_apply_options(token)
+        self._coordinators[token].api.set_local_host(
+            entry.data[CONF_DEVICE_ID], entry.options.get(CONF_HOST)
+        )
+        return self._coordinators[token]
+
+    @core.callback
+    def async_apply_options(self, token: str) -> None:
+        """ Apply the options of all entries using the token to its coordinator """
+        entries = self._references[token].values()
+
+        def _min_option(key, default):
+            return min(entry.options.get(key, default) for entry in entries)
+
+        coordinator = self._coordinators[token]
+        coordinator.set_intervals(
+            timedelta(seconds=_min_option(
+                CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL.total_seconds()
+            )),
+            timedelta(seconds=_min_option(
+                CONF_APPLIANCES_INTERVAL, DEFAULT_APPLIANCES_INTERVAL.total_seconds()
+            )),
+            timedelta(seconds=_min_option(
+                CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL.total_seconds()
+            )),
+            timedelta(seconds=_min_option(
+                CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL.total_seconds()
+            )),
+        )
+        coordinator.set_refresh_cooldown(
+            _min_option(CONF_REFRESH_COOLDOWN, DEFAULT_REFRESH_COOLDOWN)
+        )
+        coordinator.api.log_payloads = any(
+            entry.options.get(CONF_LOG_PAYLOADS, False) for entry in entries
+        )
+
+    async def async_release(self, entry: config_entries.ConfigEntry) -> None:
+        """ Drop the entry reference and shut down the coordinator if unused """
+        token = entry.data[CONF_ACCESS_TOKEN]
+        references = self._references.get(token)
+
+        if references is None:
+            return
+
+        references.pop(entry.entry_id, None)
+
+        if not references:
+            _LOGGER.debug("Shutting down coordinator released by entry %s", entry.entry_id)
+            coordinator = self._coordinators.pop(token)
+            del self._references[token]
+            self._scheduler.remove(_account_key(token))
+            await coordinator.async_shutdown()
+
+        if not self._coordinators and self._session is not None:
+            if self._cancel_close is not None:
+                self._cancel_close()
+                self._cancel_close = None
+            await self._async_close_session()
+
+    async def _async_close_session(self, _event: Optional[core.Event] = None) -> None:
+        """ Close the cloud session """
+        # The listener is removed once it fired
+        self._cancel_close = None
+        if self._session is None:
+            return
+        _LOGGER.debug("Closing Nature Remo cloud session")
+        session, self._session = self._session, None
+        await session.close()
+
+
 class NatureRemoApi():
     """ Nature Remo API """
 
-    def __init__(self, url: str, token: str, session):
+    def __init__(self, url: str, token: str, session,
+                 connections: Optional[NatureRemoConnectionStats] = None,
+                 local_session: Optional[aiohttp.ClientSession] = None):
         self.url = url
         self.token = token
         self.session = session
+        self.connections = connections
+        # LAN requests stay out of the cloud session pool and its statistics
+        self.local_session = local_session or session
+        # Raw IR messages learned for cloud signals, by signal id
+        self.messages: Dict[str, Dict[str, Any]] = {}
+        self._headers = auth_headers(token)
+        self.rate_limiter = NatureRemoRateLimiter()
+        self._cache: Dict[str, _CachedResponse] = {}
+        self._local: Dict[str, NatureRemoLocalApi] = {}
+        self.metrics = NatureRemoMetrics()
+        self.circuit_breaker = NatureRemoCircuitBreaker()
+        # Full payloads are only logged when enabled in the options, decoding
+        # them into log records is expensive on large accounts.
+        self.log_payloads = False
+
+    def set_local_host(self, device_id: str, host: Optional[str]) -> None:
+        """ Set (or clear) the LAN address used to reach a Remo device """
+        if not host:
+            self._local.pop(device_id, None)
+        elif device_id not in self._local or self._local[device_id].host != host:
+            self._local[device_id] = NatureRemoLocalApi(host, self.local_session)
+
+    def local_api(self, device_id: str) -> Optional[NatureRemoLocalApi]:
+        """ Return the LAN API of a device with an address, None if backed off """
+        local = self._local.get(device_id)
+        return local if local is not None and local.reachable else None
+
+    def sends_locally(self, device_id: str, signal_id: Optional[str] = None,
+                      message: Optional[Dict[str, Any]] = None) -> bool:
+        """ Return True if send_ir is expected to blast the signal over the LAN """
+        if message is None and signal_id is not None:
+            message = self.messages.get(signal_id)
+        return message is not None and self.local_api(device_id) is not None
+
+    @property
+    def rate_limit_remaining(self) -> int:
+        """ Return the number of requests left in the current rate limit window """
+        return self.rate_limiter.remaining
 
     async def get_me(self):
         """ Retrieve account details """
-        headers = {"Authorization": f"Bearer {self.token}"}
-        response = await self.session.get(f"{self.url}/users/me", headers=headers)
-        json = await response.json()
-        if "code" in json:
-            raise NatureRemoApiError(f"Connection error: {json['code']} {json['message']}")
-        return json
+        return await self._request("get", "/users/me", PRIORITY_COMMAND)
 
     async def get_devices(self):
         """ Retrive list of devices """
         _LOGGER.info("Fetching device list")
-        headers = {"Authorization": f"Bearer {self.token}"}
-        response = await self.session.get(f"{self.url}/devices", headers=headers)
-        json = await response.json()
-        if "code" in json:
-            raise NatureRemoApiError(f"Connection error: {json['code']} {json['message']}")
-        _LOGGER.debug(json)
-        return json
+        return await self._request("get", "/devices", PRIORITY_POLL)
 
     async def get_appliances(self):
         """ Retrive list of devices for a single device """
         _LOGGER.info("Fetching appliances list")
-        headers = {"Authorization": f"Bearer {self.token}"}
-        response = await self.session.get(f"{self.url}/appliances", headers=headers)
-        json = await response.json()
-        if "code" in json:
-            raise NatureRemoApiError(f"Connection error: {json['code']} {json['message']}")
-        _LOGGER.debug(json)
-        return json
+        return await self._request(
+            "get", "/appliances", PRIORITY_POLL, decoder=decode_appliances
+        )
 
     async def post(self, path, data):
         """Post any request"""
         _LOGGER.info("Post:%s, data:%s", path, data)
-        headers = {"Authorization": f"Bearer {self.token}"}
-        response = await self.session.post(
-            f"{self.url}{path}", data=data, headers=headers
+        return await self._request("post", path, PRIORITY_COMMAND, data=data)
+
+    async def send_ir(self, device_id: str, signal_id: Optional[str] = None,
+                      message: Optional[Dict[str, Any]] = None):
+        """
+        Send an IR signal.
+        The raw message, or the one learned for the signal, is blasted over
+        the LAN when the device has a local address and answers; otherwise the
+        signal is sent through the cloud.
+        """
+        if message is None and signal_id is not None:
+            message = self.messages.get(signal_id)
+        local = self.local_api(device_id)
+        if message is not None and local is not None:
+            try:
+                return await local.async_send_message(message)
+            except NatureRemoLocalApiError as error:
+                _LOGGER.warning("Falling back to cloud: %s", error)
+
+        if signal_id is None:
+            raise NatureRemoApiError(f"Device {device_id} not reachable on the LAN")
+        return await self.post(f"/signals/{signal_id}/send", None)
+
+    async def _request(self, method: str, path: str, priority: int, data=None,
+                       decoder=json_loads):
+        """
+        Send a request, retrying idempotent GETs on transport failures.
+        Retries wait a random (full jitter) exponential backoff.
+        """
+        attempts = 1 + (REQUEST_RETRIES if method == "get" else 0)
+        for attempt in range(attempts):
+            try:
+                return await self._send(method, path, priority, data, decoder)
+            except (NatureRemoApiConnectionError, NatureRemoApiServerError) as error:
+                if attempt + 1 >= attempts or self.circuit_breaker.is_open:
+                    raise
+                delay = random.uniform(0, RETRY_BACKOFF * 2 ** attempt)
+                _LOGGER.debug("Retrying %s in %.1f seconds: %s", path, delay, error)
+                await asyncio.sleep(delay)
+
+    async def _send(self, method: str, path: str, priority: int, data=None,
+                    decoder=json_loads):
+        """
+        Send a single request through the circuit breaker and rate limiter.
+        Requests refused by the open circuit do not use rate limit budget.
+        """
+        if not self.circuit_breaker.allow_request():
+            raise NatureRemoCircuitOpenError(
+                "Nature Remo cloud unavailable, retrying in "
+                f"{self.circuit_breaker.seconds_until_probe():.0f} seconds"
+            )
+
+        # Only the probe gets through a half open circuit
+        probe = self.circuit_breaker.state == STATE_HALF_OPEN
+        try:
+            if not await self.rate_limiter.async_acquire(priority):
+                raise NatureRemoRateLimitedError(
+                    f"Rate limit budget low, {self.rate_limiter.remaining} requests left"
+                )
+            return await self._send_request(method, path, data, decoder)
+        finally:
+            if probe:
+                # Skipped or cancelled probes record no outcome
+                self.circuit_breaker.release_probe()
+
+    async def _send_request(self, method: str, path: str, data, decoder):
+        headers = self._headers
+        endpoint = endpoint_name(method, path)
+        cached = None
+        start = time.perf_counter()
+        try:
+            if method == "post":
+                response = await self.session.post(
+                    f"{self.url}{path}", data=data, headers=headers, timeout=REQUEST_TIMEOUT
+                )
+            else:
+                cached = self._cache.get(path)
+                if cached is not None and (cached.etag or cached.last_modified):
+                    headers = dict(headers)
+                    if cached.etag:
+                        headers["If-None-Match"] = cached.etag
+                    if cached.last_modified:
+                        headers["If-Modified-Since"] = cached.last_modified
+                response = await self.session.get(
+                    f"{self.url}{path}", headers=headers, timeout=REQUEST_TIMEOUT
+                )
+            body = await _read_body(response) if response.status != 304 else b""
+        except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+            self.metrics.record_request(endpoint, time.perf_counter() - start, 0, error=True)
+            self.circuit_breaker.record_failure()
+            raise NatureRemoApiConnectionError(
+                f"Connection error: {error.__class__.__name__} {error}"
+            ) from error
+        except NatureRemoApiError:
+            # Oversized body, the cloud did answer
+            self.circuit_breaker.record_success()
+            raise
+
+        self.metrics.record_request(
+            endpoint, time.perf_counter() - start, len(body), error=response.status >= 400
         )
-        json = await response.json()
-        if "code" in json:
-            raise NatureRemoApiError(f"Connection error: {json['code']} {json['message']}")
-        _LOGGER.debug(json)
+
+        if response.status >= 500:
+            self.circuit_breaker.record_failure()
+            raise NatureRemoApiServerError(f"Server error: {response.status} {response.reason}")
+
+        # Anything else means the cloud is up
+        self.circuit_breaker.record_success()
+        self.rate_limiter.update(response.headers)
+
+        if response.status == 429:
+            self.rate_limiter.exhaust()
+            raise NatureRemoRateLimitedError("Rate limit exceeded")
+
+        if response.status == 304 and cached is not None:
+            _LOGGER.debug("Not modified: %s", path)
+            return cached.json
+
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        if response.status < 400 and cached is not None and cached.digest == digest:
+            # Same payload as last time, return the already decoded object so
+            # callers can detect the unchanged response by identity.
+            _LOGGER.debug("Unchanged: %s", path)
+            return cached.json
+
+        start = time.perf_counter()
+        try:
+            json = decoder(body) if response.status < 400 else json_loads(body)
+        except (ValueError, KeyError, TypeError) as error:
+            raise NatureRemoApiError(
+                f"Invalid response: {response.status} {response.reason}"
+            ) from error
+        self.metrics.record_decode(time.perf_counter() - start)
+
+        if isinstance(json, dict) and "code" in json:
+            error_class = NatureRemoApiAuthError if response.status == 401 else NatureRemoApiError
+            raise error_class(f"Connection error: {json['code']} {json.get('message')}")
+        if response.status == 401:
+            raise NatureRemoApiAuthError(f"Authentication error: {response.reason}")
+        if response.status >= 400:
+            raise NatureRemoApiError(f"Request error: {response.status} {response.reason}")
+
+        if self.log_payloads:
+            _LOGGER.debug("%s: %s", endpoint, json)
+
+        if method == "get":
+            self._cache[path] = _CachedResponse(
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+                digest,
+                json,
+            )
         return json
 
 
+async def _read_body(response: aiohttp.ClientResponse) -> bytes:
+    """ Read the (decompressed) body, refusing bodies over MAX_RESPONSE_SIZE """
+    if (response.content_length or 0) > MAX_RESPONSE_SIZE:
+        response.release()
+        raise NatureRemoApiError(f"Response too large: {response.content_length} bytes")
+    body = bytearray()
+    async for chunk in response.content.iter_chunked(64 * 1024):
+        body += chunk
+        if len(body) > MAX_RESPONSE_SIZE:
+            response.close()
+            raise NatureRemoApiError(f"Response larger than {MAX_RESPONSE_SIZE} bytes")
+    return bytes(body)
+
+
+def _changed_ids(previous: Dict[str, Any], current: Dict[str, Any]) -> Set[str]:
+    """
+    Return ids whose payload differs from the previous snapshot, including
+    ids that left the account so their entities become unavailable.
+    Unchanged responses are the same objects, so the identity check
+    short-circuits most comparisons; otherwise the raw dicts (including the
+    created_at strings) are compared without parsing anything.
+    """
+    if previous is current:
+        return set()
+    changed = {
+        item_id for item_id, item in current.items()
+        if previous.get(item_id) != item
+    }
+    return changed | (previous.keys() - current.keys())
+
+
+def _motion_detected(previous: Dict[str, Any], current: Dict[str, Any]) -> bool:
+    """ Return True if a motion event was received since the previous snapshot """
+    if previous is current:
+        return False
+    for device_id, device in current.items():
+        motion = device.get("newest_events", {}).get("mo")
+        if motion is None:
+            continue
+        before = previous.get(device_id, {}).get("newest_events", {}).get("mo")
+        if before is None or before.get("created_at") != motion.get("created_at"):
+            return True
+    return False
+
+
+class _CachedResponse(NamedTuple):
+    """ Last response received from a GET endpoint """
+
+    etag: Optional[str]
+    last_modified: Optional[str]
+    digest: bytes
+    json: Any
+
+
+class _ApplianceIndex(NamedTuple):
+    """ Indexes of an appliance snapshot """
+
+    entities: Dict[str, Appliance]
+    types: Dict[Tuple[str, str], Tuple[Appliance, ...]]
+    platforms: Dict[str, Set[str]]
+
+
 class NatureRemoApiError(Exception):
     """ Nature Remo API error exception """
 
 
+class NatureRemoRateLimitedError(NatureRemoApiError):
+    """ Nature Remo API rate limit exception """
+
+
+class NatureRemoApiConnectionError(NatureRemoApiError):
+    """ Nature Remo API timeout or connection exception """
+
+
+class NatureRemoApiServerError(NatureRemoApiError):
+    """ Nature Remo API 5xx response exception """
+
+
+class NatureRemoApiAuthError(NatureRemoApiError):
+    """ Nature Remo API invalid token exception """
+
+
+class NatureRemoCircuitOpenError(NatureRemoApiError):
+    """ Nature Remo cloud considered down, request not sent """
+
+
 class NatureRemoApiCoordinator(DataUpdateCoordinator):
     """ Nature Remo API Coordinator """
 
-    def __init__(self, hass, api):
+    def __init__(self, hass, api, scheduler: Optional[NatureRemoPollScheduler] = None):
+        debouncer = Debouncer(
+            hass, _LOGGER, cooldown=DEFAULT_REFRESH_COOLDOWN, immediate=False
+        )
         super().__init__(
             hass,
             _LOGGER,
+            # Shared by every entry of the token, the registry shuts it down
+            # with the last one instead of the entry being set up first.
+            config_entry=None,
             name="Nature Remo",
-            update_interval=timedelta(seconds=60),
+            update_interval=DEFAULT_SCAN_INTERVAL,
+            request_refresh_debouncer=debouncer,
+            # Unchanged snapshots are returned as the same object and must not
+            # wake up the entities.
+            always_update=False,
         )
+        # Count refresh requests that actually reach the cloud
+        debouncer.function = self._async_debounced_refresh
+        self._debouncer = debouncer
+        self._first_refresh_lock = asyncio.Lock()
+        self.refresh_requests = 0
+        self.refresh_requests_sent = 0
         self.api = api
+        self.account = _account_key(api.token)
+        self._scheduler = scheduler
+        self._indexes: Dict[str, Tuple[Any, Dict[str, Any]]] = {}
+        self._appliance_index: Optional[_ApplianceIndex] = None
+        self._device_locks: Dict[str, asyncio.Lock] = {}
+        self.changed_devices: Set[str] = set()
+        self.changed_appliances: Set[str] = set()
+        self._store = _snapshot_store(hass, api.token)
+        self._messages_store = _messages_store(hass, api.token)
+        self.restored_at: Optional[datetime] = None
+        self._base_interval = DEFAULT_SCAN_INTERVAL
+        self._appliances_interval = DEFAULT_APPLIANCES_INTERVAL
+        self._appliances_fetched_at: Optional[float] = None
+        self._appliances_stale = True
+        self._min_interval = DEFAULT_MIN_INTERVAL
+        self._max_interval = DEFAULT_MAX_INTERVAL
+        self._adaptive_interval = DEFAULT_SCAN_INTERVAL
+        self._boost_until = 0.0
+
+    def set_intervals(self, scan_interval: timedelta, appliances_interval: timedelta,
+                      min_interval: timedelta = DEFAULT_MIN_INTERVAL,
+                      max_interval: timedelta = DEFAULT_MAX_INTERVAL) -> None:
+        """
+        Set the polling intervals.
+        Sensor readings from /devices are fetched every scan interval while the
+        appliance catalogue is only refreshed every appliances interval or after
+        a command has been posted. The scan interval adapts between min and max
+        interval depending on activity.
+        """
+        self._min_interval = min(min_interval, scan_interval)
+        self._max_interval = max(max_interval, scan_interval)
+        self._base_interval = scan_interval
+        self._appliances_interval = appliances_interval
+        self._adaptive_interval = scan_interval
+        self.update_interval = scan_interval
+
+    @core.callback
+    def async_boost(self) -> None:
+        """
+        Poll at the minimum interval for a while, e.g. after a command.
+        The already scheduled poll is moved forward.
+        """
+        self._boost_until = time.monotonic() + BOOST_DURATION.total_seconds()
+        self._adaptive_interval = self._min_interval
+        if self.update_interval is not None and self.update_interval > self._min_interval:
+            self.update_interval = self._min_interval
+            self._schedule_refresh()
+
+    def _next_adaptive_interval(self, devices: Dict[str, Any]) -> timedelta:
+        """
+        Return the next poll interval based on the observed change rate.
+        Poll fast while boosted (after a command or motion), return to the scan
+        interval when readings change and back off exponentially up to the
+        maximum interval while they are stable.
+        """
+        if self.data is not None and _motion_detected(self.data[CONF_DEVICES], devices):
+            self._boost_until = time.monotonic() + BOOST_DURATION.total_seconds()
+
+        if time.monotonic() < self._boost_until:
+            self._adaptive_interval = self._min_interval
+        elif self.changed_devices:
+            self._adaptive_interval = self._base_interval
+        else:
+            self._adaptive_interval = min(
+                max(self._adaptive_interval * 2, self._base_interval), self._max_interval
+            )
+        return self._adaptive_interval
+
+    def set_refresh_cooldown(self, cooldown: float) -> None:
+        """ Set the cooldown used to coalesce entity refresh requests """
+        self._debouncer.cooldown = cooldown
+
+    @property
+    def refresh_requests_coalesced(self) -> int:
+        """ Return the number of refresh requests merged into another one """
+        return self.refresh_requests - self.refresh_requests_sent
+
+    async def async_first_refresh(self) -> None:
+        """ Run the first refresh once for all entries sharing the coordinator """
+        async with self._first_refresh_lock:
+            if self.data is not None:
+                return
+
+            self.api.messages = await self._messages_store.async_load() or {}
+            if await self._async_restore_snapshot():
+                # Entities are created from the cached snapshot right away and
+                # the cloud is queried in the background.
+                self.hass.async_create_background_task(
+                    self.async_refresh(), name=f"{DOMAIN} revalidate snapshot"
+                )
+                return
+
+            await self.async_refresh()
+            if not self.last_update_success:
+                raise ConfigEntryNotReady from self.last_exception
+
+    async def _async_restore_snapshot(self) -> bool:
+        """ Load the cached snapshot, return False if there is none """
+        cached = await self._store.async_load()
+        if not cached:
+            return False
+
+        saved_at = cached.get(ATTR_SAVED_AT)
+        self.restored_at = dt_util.parse_datetime(saved_at) if saved_at else None
+        _LOGGER.debug("Starting from snapshot saved at %s", saved_at)
+        self.async_set_updated_data({
+            CONF_DEVICES: cached[CONF_DEVICES],
+            CONF_ENTITIES: {
+                appliance_id: Appliance.from_dict(appliance)
+                for appliance_id, appliance in cached[CONF_ENTITIES].items()
+            },
+        })
+        return True
+
+    @property
+    def restored(self) -> bool:
+        """ Return True while data comes from the cache and was not revalidated """
+        return self.restored_at is not None
+
+    async def async_request_refresh(self) -> None:
+        """ Request a debounced refresh """
+        self.refresh_requests += 1
+        await super().async_request_refresh()
+
+    async def _async_debounced_refresh(self) -> None:
+        self.refresh_requests_sent += 1
+        _LOGGER.debug(
+            "Refreshing on request, %d of %d requests coalesced",
+            self.refresh_requests_coalesced, self.refresh_requests,
+        )
+        await self.async_refresh()
+
+    def _appliances_due(self) -> bool:
+        if self._appliances_stale or self._appliances_fetched_at is None:
+            return True
+        elapsed = time.monotonic() - self._appliances_fetched_at
+        return elapsed >= self._appliances_interval.total_seconds()
+
+    def _requests_per_poll(self) -> float:
+        return 1 + self._adaptive_interval / self._appliances_interval
 
     async def async_validate_token(self):
         """ Return account details """
@@ -106,23 +800,182 @@ class NatureRemoApiCoordinator(DataUpdateCoordinator):
 
     async def async_get_devices(self):
         """ Return dictionary of devices """
-        return {x["id"]: x for x in await self.api.get_devices()}
+        return self._index("devices", await self.api.get_devices())
 
     async def async_get_appliances(self):
         """ Return dictionary of appliances """
-        return {x["id"]: x for x in await self.api.get_appliances()}
+        return self._index("appliances", await self.api.get_appliances(), attrgetter("id"))
+
+    def _index(self, key: str, items: Sequence[Any],
+               get_id: Callable[[Any], str] = itemgetter("id")) -> Dict[str, Any]:
+        """ Index items by id, reusing the previous index if the list is unchanged """
+        previous = self._indexes.get(key)
+        if previous is not None and previous[0] is items:
+            return previous[1]
+        index = {get_id(x): x for x in items}
+        self._indexes[key] = (items, index)
+        return index
+
+    def _index_appliances(self) -> "_ApplianceIndex":
+        """
+        Return the (device, type) and platform indexes of the appliances.
+        They are built once per snapshot of the appliance list so platforms do
+        not rescan every appliance of the account.
+        """
+        entities = self.data[CONF_ENTITIES]
+        index = self._appliance_index
+        if index is not None and index.entities is entities:
+            return index
+
+        grouped: Dict[Tuple[str, str], List[Appliance]] = {}
+        platforms: Dict[str, Set[str]] = {}
+        for appliance in entities.values():
+            grouped.setdefault((appliance.device_id, appliance.type), []).append(appliance)
+            needed = platforms.setdefault(appliance.device_id, set())
+            if appliance.type in APPLIANCE_PLATFORMS:
+                needed.add(APPLIANCE_PLATFORMS[appliance.type])
+            if appliance.signals or appliance.buttons:
+                needed.add("button")
+        self._appliance_index = _ApplianceIndex(
+            entities, {key: tuple(items) for key, items in grouped.items()}, platforms
+        )
+        return self._appliance_index
+
+    def appliances(self, device_id: str, appliance_type: str) -> Tuple[Appliance, ...]:
+        """ Return the appliances of a type registered on a device """
+        return self._index_appliances().types.get((device_id, appliance_type), ())
+
+    def platforms(self, device_id: str) -> List[str]:
+        """
+        Return the platforms with entities for a device, none if the device
+        is not in the account. Device sensors and metrics are always loaded.
+        """
+        if device_id not in self.data[CONF_DEVICES]:
+            return []
+        needed = self._index_appliances().platforms.get(device_id, set())
+        return [platform for platform in PLATFORMS if platform == "sensor" or platform in needed]
+
+    def device_lock(self, device_id: str) -> asyncio.Lock:
+        """ Return the lock serializing IR commands sent by a Remo device """
+        lock = self._device_locks.get(device_id)
+        if lock is None:
+            lock = self._device_locks[device_id] = asyncio.Lock()
+        return lock
+
+    def _path_device(self, path: str) -> Optional[str]:
+        """ Return the Remo device blasting a command posted to an appliance path """
+        parts = path.split("/")
+        if len(parts) < 3 or parts[1] != "appliances" or self.data is None:
+            return None
+        appliance = self.data[CONF_ENTITIES].get(parts[2])
+        return appliance.device_id if appliance is not None else None
 
     async def async_post(self, path, data):
-        """ Post data to Nature Remo cloud """
-        return await self.api.post(path, data)
+        """
+        Post data to Nature Remo cloud.
+        Appliance commands wait for the other IR commands of their Remo device,
+        which blasts one signal at a time.
+        """
+        device_id = self._path_device(path)
+        lock = self.device_lock(device_id) if device_id else contextlib.nullcontext()
+        async with lock:
+            response = await self.api.post(path, data)
+        self._appliances_stale = True
+        self.async_boost()
+        return response
+
+    async def async_send_ir(self, device_id: str, signal_id: Optional[str] = None,
+                            message: Optional[Dict[str, Any]] = None):
+        """ Send an IR signal, over the LAN when possible """
+        async with self.device_lock(device_id):
+            return await self.api.send_ir(device_id, signal_id, message)
+
+    async def async_learn_message(self, device_id: str, signal_id: str) -> Dict[str, Any]:
+        """
+        Store the IR message last received by a Remo as the raw form of a
+        signal, so the signal is blasted over the LAN from now on.
+        """
+        local = self.api.local_api(device_id)
+        if local is None:
+            raise NatureRemoApiError(f"Device {device_id} not reachable on the LAN")
+        try:
+            message = await local.async_get_message()
+        except NatureRemoLocalApiError as error:
+            raise NatureRemoApiError(str(error)) from error
+        self.api.messages[signal_id] = message
+        await self._messages_store.async_save(self.api.messages)
+        return message
+
+    def _track_changes(self, devices: Dict[str, Any], appliances: Dict[str, Any]) -> None:
+        """
+        Record which devices and appliances changed since the previous snapshot.
+        After a failed update, or when replacing a restored snapshot, every id is
+        reported as changed so entities refresh their availability.
+        """
+        if self.data is None or not self.last_update_success or self.restored:
+            self.changed_devices = set(devices)
+            self.changed_appliances = set(appliances)
+            return
+
+        self.changed_devices = _changed_ids(self.data[CONF_DEVICES], devices)
+        self.changed_appliances = _changed_ids(self.data[CONF_ENTITIES], appliances)
+
+    def device_changed(self, device_id: str) -> bool:
+        """ Return True if entities of the device must write their state """
+        return not self.last_update_success or device_id in self.changed_devices
+
+    def appliance_changed(self, appliance_id: str) -> bool:
+        """ Return True if entities of the appliance must write their state """
+        return not self.last_update_success or appliance_id in self.changed_appliances
+
+    @property
+    def metrics(self) -> NatureRemoMetrics:
+        """ Return the API client metrics """
+        return self.api.metrics
 
     async def _async_update_data(self):
         """ Fetch Nature Remo data from Cloud """
         _LOGGER.info("Fetching Nature Remo data")
+        start = time.perf_counter()
         try:
-            return {
-                CONF_DEVICES: await self.async_get_devices(),
-                CONF_ENTITIES: await self.async_get_appliances()
+            if self.data is None or self._appliances_due():
+                devices, appliances = await asyncio.gather(
+                    self.async_get_devices(), self.async_get_appliances()
+                )
+                self._appliances_fetched_at = time.monotonic()
+                self._appliances_stale = False
+            else:
+                devices = await self.async_get_devices()
+                appliances = self.data[CONF_ENTITIES]
+
+            self._track_changes(devices, appliances)
+            self._next_adaptive_interval(devices)
+
+            if (self.data is not None and devices is self.data[CONF_DEVICES]
+                    and appliances is self.data[CONF_ENTITIES]):
+                return self.data
+
+            data = {
+                CONF_DEVICES: devices,
+                CONF_ENTITIES: appliances
             }
+            self.restored_at = None
+            self._store.async_delay_save(lambda: _compact_snapshot(data), STORAGE_SAVE_DELAY)
+            return data
+        except NatureRemoRateLimitedError as error:
+            # A skipped poll only keeps the data fresh if the last one worked
+            if self.data is None or not self.last_update_success:
+                raise UpdateFailed(f"Nature Remo API rate limited: {error}") from error
+            _LOGGER.info("Skipping Nature Remo poll: %s", error)
+            self._track_changes(self.data[CONF_DEVICES], self.data[CONF_ENTITIES])
+            return self.data
         except NatureRemoApiError as error:
             raise UpdateFailed(f"Error communicating with Nature Remo API: {error}") from error
+        finally:
+            self.metrics.record_update(time.perf_counter() - start)
+            interval = self.api.rate_limiter.stretch_interval(
+                self._adaptive_interval, requests_per_poll=self._requests_per_poll()
+            )
+            if self._scheduler is not None:
+                interval = self._scheduler.align(self.account, interval)
+            self.update_interval = interval
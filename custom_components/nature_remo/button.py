@@ -0,0 +1,89 @@
+""" Support for Nature Remo IR signals and preset buttons """
+import logging
+
+from typing import Any, Dict
+from homeassistant import config_entries, core
+from homeassistant.components.button import ButtonEntity
+from homeassistant.const import CONF_DEVICE_ID, CONF_DEVICES
+from . import (NatureRemoApiCoordinator, async_get_coordinator)
+from .const import (
+    APPLIANCE_AC, APPLIANCE_IR, APPLIANCE_LIGHT, APPLIANCE_TV, BUTTON_PATHS
+)
+from .entity import appliance_device_info
+from .models import (Appliance, Button, Signal)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Appliance types with learned signals, smart meters have none
+SIGNAL_TYPES = (APPLIANCE_AC, APPLIANCE_TV, APPLIANCE_LIGHT, APPLIANCE_IR)
+
+
+async def async_setup_entry(
+    hass: core.HomeAssistant,
+    config_entry: config_entries.ConfigEntry,
+    async_add_entities,
+):
+    """ Setup buttons from a config_flow entry """
+    coordinator = async_get_coordinator(hass, config_entry)
+    device_id = config_entry.data[CONF_DEVICE_ID]
+    device = coordinator.data[CONF_DEVICES].get(device_id)
+    entities = []
+
+    if device is None:
+        _LOGGER.warning("Device %s not found in Nature Remo account", device_id)
+        return
+
+    for appliance_type in SIGNAL_TYPES:
+        for appliance in coordinator.appliances(device_id, appliance_type):
+            for signal in appliance.signals:
+                entities.append(NatureRemoSignalButton(device, appliance, signal, coordinator))
+            if appliance_type in BUTTON_PATHS:
+                for button in appliance.buttons:
+                    entities.append(
+                        NatureRemoPresetButton(device, appliance, button, coordinator)
+                    )
+
+    async_add_entities(entities)
+
+
+class NatureRemoButtonBase(ButtonEntity):
+    """
+    Nature Remo button base class.
+    Buttons are stateless, they do not listen to coordinator updates.
+    """
+
+    def __init__(self, device: Dict[str, Any], appliance: Appliance,
+                 coordinator: NatureRemoApiCoordinator):
+        self.coordinator = coordinator
+        self._appliance_name = appliance.nickname or appliance.model_name
+        self._device_id = device["id"]
+        self._attr_device_info = appliance_device_info(device, appliance)
+
+
+class NatureRemoSignalButton(NatureRemoButtonBase):
+    """ Send a learned IR signal """
+
+    def __init__(self, device: Dict[str, Any], appliance: Appliance, signal: Signal,
+                 coordinator: NatureRemoApiCoordinator):
+        super().__init__(device, appliance, coordinator)
+        self._signal_id = signal.id
+        self._attr_unique_id = signal.id
+        self._attr_name = f"{self._appliance_name} {signal.name}"
+
+    async def async_press(self) -> None:
+        await self.coordinator.async_send_ir(self._device_id, self._signal_id)
+
+
+class NatureRemoPresetButton(NatureRemoButtonBase):
+    """ Press a preset button of a TV or light """
+
+    def __init__(self, device: Dict[str, Any], appliance: Appliance, button: Button,
+                 coordinator: NatureRemoApiCoordinator):
+        super().__init__(device, appliance, coordinator)
+        self._path = f"/appliances/{appliance.id}/{BUTTON_PATHS[appliance.type]}"
+        self._button = button.name
+        self._attr_unique_id = f"{appliance.id}-{button.name}"
+        self._attr_name = f"{self._appliance_name} {button.label or button.name}"
+
+    async def async_press(self) -> None:
+        await self.coordinator.async_post(self._path, {"button": self._button})
@@ -0,0 +1,87 @@
+""" Nature Remo cloud circuit breaker """
+import logging
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# Consecutive transport failures before the circuit opens
+FAILURE_THRESHOLD = 5
+# Seconds the circuit stays open before a probe request is allowed
+RESET_TIMEOUT = 60
+# Upper bound of the open period when probes keep failing
+MAX_RESET_TIMEOUT = 900
+
+
+class NatureRemoCircuitBreaker():
+    """
+    Circuit breaker for the Nature Remo cloud.
+    Opens after consecutive transport failures (timeouts, connection errors
+    and 5xx responses) so an outage is not hammered with requests. Once the
+    reset timeout has passed a single probe request is let through; success
+    closes the circuit and failure opens it again with a doubled timeout.
+    """
+
+    def __init__(self, threshold: int = FAILURE_THRESHOLD, reset_timeout: float = RESET_TIMEOUT):
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self._threshold = threshold
+        self._base_timeout = reset_timeout
+        self._reset_timeout = reset_timeout
+        self._opened_at = 0.0
+        self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        """ Return True while requests are being refused """
+        return self.state != STATE_CLOSED
+
+    def seconds_until_probe(self) -> float:
+        """ Return seconds until the next probe is allowed """
+        if self.state == STATE_CLOSED:
+            return 0.0
+        return max(0.0, self._opened_at + self._reset_timeout - time.monotonic())
+
+    def allow_request(self) -> bool:
+        """ Return True if a request may be sent now """
+        if self.state == STATE_CLOSED:
+            return True
+        if self._probing or self.seconds_until_probe() > 0:
+            return False
+        _LOGGER.debug("Circuit half open, sending probe")
+        self.state = STATE_HALF_OPEN
+        self._probing = True
+        return True
+
+    def release_probe(self) -> None:
+        """ Let another probe through, the probe ended without an outcome """
+        self._probing = False
+
+    def record_success(self) -> None:
+        """ Record a request that reached the cloud """
+        if self.state != STATE_CLOSED:
+            _LOGGER.info("Nature Remo cloud reachable again, closing circuit")
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self._probing = False
+        self._reset_timeout = self._base_timeout
+
+    def record_failure(self) -> None:
+        """ Record a transport failure """
+        self.failures += 1
+        if self.state == STATE_HALF_OPEN:
+            self._reset_timeout = min(self._reset_timeout * 2, MAX_RESET_TIMEOUT)
+            self._open()
+        elif self.state == STATE_CLOSED and self.failures >= self._threshold:
+            self._open()
+
+    def _open(self) -> None:
+        _LOGGER.warning(
+            "Nature Remo cloud failing, pausing requests for %.0f seconds", self._reset_timeout
+        )
+        self.state = STATE_OPEN
+        self._opened_at = time.monotonic()
+        self._probing = False
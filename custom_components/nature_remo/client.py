@@ -0,0 +1,107 @@
+""" Nature Remo cloud HTTP client session """
+from types import MappingProxyType, SimpleNamespace
+from typing import Any, Dict, Mapping, Optional
+
+import aiohttp
+from homeassistant import core
+from homeassistant.const import __version__ as HA_VERSION
+from homeassistant.util.ssl import client_context
+
+# Connections kept open per host, polls and commands rarely overlap
+CONNECTION_LIMIT_PER_HOST = 4
+# Idle keep-alive connections are closed after this many seconds, longer
+# than the default scan interval so each poll finds a warm connection.
+KEEPALIVE_TIMEOUT = 75
+# Seconds resolved addresses are cached
+DNS_CACHE_TTL = 300
+
+SESSION_HEADERS = MappingProxyType({
+    "Accept": "application/json",
+    "Accept-Encoding": "gzip, deflate",
+    "User-Agent": f"HomeAssistant/{HA_VERSION} nature_remo",
+})
+
+
+def auth_headers(token: str) -> Mapping[str, str]:
+    """ Return the immutable headers sent with every request of an account """
+    return MappingProxyType({"Authorization": f"Bearer {token}"})
+
+
+class NatureRemoConnectionStats():
+    """
+    Connection pool statistics collected through aiohttp tracing.
+    New connections to https hosts each cost a TLS handshake.
+    """
+
+    def __init__(self):
+        self.new_connections = 0
+        self.reused_connections = 0
+        self.tls_handshakes = 0
+        self.dns_cache_hits = 0
+        self.dns_cache_misses = 0
+
+    @property
+    def reuse_rate(self) -> Optional[float]:
+        """ Return the share of requests sent on a kept-alive connection """
+        total = self.new_connections + self.reused_connections
+        return self.reused_connections / total if total else None
+
+    def as_dict(self) -> Dict[str, Any]:
+        """ Return the statistics as a serializable dict """
+        return {
+            "new_connections": self.new_connections,
+            "reused_connections": self.reused_connections,
+            "reuse_rate": self.reuse_rate,
+            "tls_handshakes": self.tls_handshakes,
+            "dns_cache_hits": self.dns_cache_hits,
+            "dns_cache_misses": self.dns_cache_misses,
+        }
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """ Return a trace config updating these statistics """
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(self._on_request_start)
+        trace.on_connection_create_end.append(self._on_connection_create_end)
+        trace.on_connection_reuseconn.append(self._on_connection_reuseconn)
+        trace.on_dns_cache_hit.append(self._on_dns_cache_hit)
+        trace.on_dns_cache_miss.append(self._on_dns_cache_miss)
+        return trace
+
+    async def _on_request_start(self, _session, context: SimpleNamespace, params) -> None:
+        context.secure = params.url.scheme == "https"
+
+    async def _on_connection_create_end(self, _session, context: SimpleNamespace, _params) -> None:
+        self.new_connections += 1
+        if getattr(context, "secure", False):
+            self.tls_handshakes += 1
+
+    async def _on_connection_reuseconn(self, _session, _context, _params) -> None:
+        self.reused_connections += 1
+
+    async def _on_dns_cache_hit(self, _session, _context, _params) -> None:
+        self.dns_cache_hits += 1
+
+    async def _on_dns_cache_miss(self, _session, _context, _params) -> None:
+        self.dns_cache_misses += 1
+
+
+@core.callback
+def async_create_session(stats: NatureRemoConnectionStats) -> aiohttp.ClientSession:
+    """
+    Create the session used to reach the Nature cloud.
+    It has its own connector so keep-alive connections to the cloud are not
+    evicted by other integrations sharing Home Assistant's session.
+    """
+    connector = aiohttp.TCPConnector(
+        limit_per_host=CONNECTION_LIMIT_PER_HOST,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        use_dns_cache=True,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        ssl=client_context(),
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers=SESSION_HEADERS,
+        trace_configs=[stats.trace_config()],
+        auto_decompress=True,
+    )
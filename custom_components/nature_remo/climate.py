@@ -1,7 +1,12 @@
 """ Support for Nature Remo AC """
+import asyncio
+import dataclasses
+import functools
 import logging
 
-from typing import Any, Dict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+from homeassistant.components import persistent_notification
 from homeassistant.components.climate import ClimateEntity
 from homeassistant import config_entries, core
 from homeassistant.const import (
@@ -13,10 +18,14 @@ from homeassistant.components.climate.const import (
     HVACMode,
     ClimateEntityFeature,
 )
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.const import (UnitOfTemperature, ATTR_TEMPERATURE)
-from . import (NatureRemoApiCoordinator)
-from .const import (DOMAIN, COORDINATOR)
+from . import (NatureRemoApiCoordinator, async_get_coordinator)
+from .commands import NatureRemoCommandBuffer
+from .const import (
+    DOMAIN, APPLIANCE_AC, ATTR_PENDING_COMMANDS, COMMAND_COALESCE_DELAY, CONF_OPTIMISTIC
+)
+from .entity import NatureRemoEntity
+from .models import (Appliance, AirconMode, AirconSettings)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -40,6 +49,79 @@ MODE_REMO_TO_HA = {
     "power-off": HVACMode.OFF,
 }
 
+# Aircon settings changed by each POST field
+POST_FIELDS = {
+    "temperature": "temp",
+    "operation_mode": "mode",
+    "air_volume": "vol",
+    "air_direction": "dir",
+    "button": "button",
+}
+
+
+def _apply_command(settings: AirconSettings, data: Dict[str, Any]) -> AirconSettings:
+    """ Return the settings expected once the POST data is applied """
+    changes = {POST_FIELDS[key]: str(value) for key, value in data.items() if key in POST_FIELDS}
+    # Sending settings without a button switches the aircon on
+    changes.setdefault("button", "")
+    return dataclasses.replace(settings, **changes)
+
+
+@dataclass(frozen=True, eq=False)
+class ModeCapabilities:
+    """ Precomputed limits of an aircon mode """
+
+    min_temp: float = 0
+    max_temp: float = 0
+    step: float = 1
+    fan_modes: List[str] = field(default_factory=list)
+    swing_modes: List[str] = field(default_factory=list)
+
+
+NO_CAPABILITIES = ModeCapabilities()
+
+
+@dataclass(frozen=True, eq=False)
+class AirconCapabilities:
+    """ Precomputed capabilities of an aircon model """
+
+    modes: Tuple[Tuple[str, AirconMode], ...]
+    hvac_modes: List[HVACMode]
+    per_mode: Dict[str, ModeCapabilities]
+
+
+def _mode_capabilities(mode: AirconMode) -> ModeCapabilities:
+    temp_range = [float(temp) for temp in mode.temp if temp]
+    step = 1
+    if len(temp_range) >= 2:
+        # determine step from the gap of first and second temperature
+        gap = round(temp_range[1] - temp_range[0], 1)
+        if gap in [1.0, 0.5]:  # valid steps
+            step = gap
+    return ModeCapabilities(
+        min(temp_range) if temp_range else 0,
+        max(temp_range) if temp_range else 0,
+        step,
+        list(mode.vol),
+        list(mode.dir),
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def aircon_capabilities(modes: Tuple[Tuple[str, AirconMode], ...]) -> AirconCapabilities:
+    """
+    Return the capabilities of an aircon range.
+    Cached by range so entities of the same model share one instance, and a
+    new instance is only built when the range payload changes.
+    """
+    hvac_modes = [MODE_REMO_TO_HA[name] for name, _ in modes if name in MODE_REMO_TO_HA]
+    hvac_modes.append(HVACMode.OFF)
+    return AirconCapabilities(
+        modes,
+        hvac_modes,
+        {name: _mode_capabilities(mode) for name, mode in modes},
+    )
+
 
 async def async_setup_entry(
     hass: core.HomeAssistant,
@@ -47,39 +129,35 @@ async def async_setup_entry(
     async_add_entities,
 ):
     """ Setup entities from a config_flow entry """
-    config = hass.data[DOMAIN][config_entry.entry_id]
-    coordinator = hass.data[DOMAIN][COORDINATOR]
-    device_id = config[CONF_DEVICE_ID]
-    device = config[CONF_DEVICES][device_id]
+    coordinator = async_get_coordinator(hass, config_entry)
+    device_id = config_entry.data[CONF_DEVICE_ID]
+    device = coordinator.data[CONF_DEVICES].get(device_id)
     entities = []
 
-    if CONF_ENTITIES in config:
-        for _, appliance in config[CONF_ENTITIES].items():
-            # Ignore any appliance that do not belong to the device entry we are
-            # registering
-            if appliance["device"]["id"] != device_id:
-                continue
+    if device is None:
+        _LOGGER.warning("Device %s not found in Nature Remo account", device_id)
+        return
 
-            if appliance["type"] == "AC":
-                entities.append(NatureRemoAC(device, appliance, coordinator))
+    for appliance in coordinator.appliances(device_id, APPLIANCE_AC):
+        entities.append(NatureRemoAC(device, appliance, coordinator, config_entry))
 
-        async_add_entities(entities, update_before_add=True)
+    async_add_entities(entities)
 
 
-class NatureRemoAC(CoordinatorEntity, ClimateEntity):
+class NatureRemoAC(NatureRemoEntity, ClimateEntity):
     """ Implement Nature Remo E sensor """
 
-    def __init__(self, device: Dict[str, Any], appliance: Dict[str, Any],
-                 coordinator: NatureRemoApiCoordinator):
-        super().__init__(coordinator)
-        self._name = f"{device['name']} - {appliance['model']['name']}"
-        self._appliance_id = appliance["id"]
-        self._available = True
+    def __init__(self, device: Dict[str, Any], appliance: Appliance,
+                 coordinator: NatureRemoApiCoordinator,
+                 config_entry: config_entries.ConfigEntry):
+        super().__init__(coordinator, device, appliance)
+        self._entry = config_entry
+        self._name = f"{device['name']} - {appliance.model_name}"
         self._default_temp = {
             HVACMode.COOL: 20,
             HVACMode.HEAT: 20,
         }
-        self._modes = appliance["aircon"]["range"]["modes"]
+        self._capabilities = aircon_capabilities(appliance.modes)
         self._hvac_mode = None
         self._current_temperature = None
         self._target_temperature = None
@@ -87,12 +165,14 @@ class NatureRemoAC(CoordinatorEntity, ClimateEntity):
         self._fan_mode = None
         self._swing_mode = None
         self._last_target_temperature = {v: None for v in MODE_REMO_TO_HA}
-        self._device_id = device["id"]
-        self._device_name = appliance['model']['name']
-        self._manufacturer = appliance["model"]["manufacturer"]
-        self._serial_number = device["serial_number"]
-        self._firmware_version = device["firmware_version"]
-        self._update(appliance["settings"], device)
+        self._commands = NatureRemoCommandBuffer(
+            coordinator.hass, self._async_post_settings, self._apply_response,
+            COMMAND_COALESCE_DELAY,
+        )
+        # Last settings confirmed by the cloud and optimistic changes in flight
+        self._confirmed = appliance.settings
+        self._pending: Dict[str, Any] = {}
+        self._update(appliance.settings, device)
 
     @property
     def name(self) -> str:
@@ -102,20 +182,6 @@ class NatureRemoAC(CoordinatorEntity, ClimateEntity):
     def unique_id(self) -> str:
         return self._appliance_id
 
-    @property
-    def available(self) -> bool:
-        return self._available
-
-    @property
-    def device_info(self):
-        return {
-            "identifiers": {(DOMAIN, self._appliance_id)},
-            "name": self._device_name,
-            "manufacturer": "Nature Remo",
-            "model": self._serial_number,
-            "sw_version": self._firmware_version,
-        }
-
     @property
     def supported_features(self):
         """Return the list of supported features."""
@@ -134,18 +200,12 @@ class NatureRemoAC(CoordinatorEntity, ClimateEntity):
     @property
     def min_temp(self):
         """Return the minimum temperature."""
-        temp_range = self._current_mode_temp_range()
-        if len(temp_range) == 0:
-            return 0
-        return min(temp_range)
+        return self._current_mode_capabilities().min_temp
 
     @property
     def max_temp(self):
         """Return the maximum temperature."""
-        temp_range = self._current_mode_temp_range()
-        if len(temp_range) == 0:
-            return 0
-        return max(temp_range)
+        return self._current_mode_capabilities().max_temp
 
     @property
     def target_temperature(self):
@@ -156,13 +216,7 @@ class NatureRemoAC(CoordinatorEntity, ClimateEntity):
     @property
     def target_temperature_step(self):
         """Return the supported step of target temperature."""
-        temp_range = self._current_mode_temp_range()
-        if len(temp_range) >= 2:
-            # determine step from the gap of first and second temperature
-            step = round(temp_range[1] - temp_range[0], 1)
-            if step in [1.0, 0.5]:  # valid steps
-                return step
-        return 1
+        return self._current_mode_capabilities().step
 
     @property
     def hvac_mode(self):
@@ -172,10 +226,7 @@ class NatureRemoAC(CoordinatorEntity, ClimateEntity):
     @property
     def hvac_modes(self):
         """Return the list of available operation modes."""
-        remo_modes = list(self._modes.keys())
-        ha_modes = list(map(lambda mode: MODE_REMO_TO_HA[mode], remo_modes))
-        ha_modes.append(HVACMode.OFF)
-        return ha_modes
+        return self._capabilities.hvac_modes
 
     @property
     def fan_mode(self):
@@ -185,7 +236,7 @@ class NatureRemoAC(CoordinatorEntity, ClimateEntity):
     @property
     def fan_modes(self):
         """List of available fan modes."""
-        return self._modes[self._remo_mode]["vol"]
+        return self._current_mode_capabilities().fan_modes
 
     @property
     def swing_mode(self):
@@ -195,14 +246,18 @@ class NatureRemoAC(CoordinatorEntity, ClimateEntity):
     @property
     def swing_modes(self):
         """List of available swing modes."""
-        return self._modes[self._remo_mode]["dir"]
+        return self._current_mode_capabilities().swing_modes
 
     @property
     def extra_state_attributes(self):
         """Return device specific state attributes."""
-        return {
+        attributes = {
             "previous_target_temperature": self._last_target_temperature,
+            **(super().extra_state_attributes or {}),
         }
+        if self._pending:
+            attributes[ATTR_PENDING_COMMANDS] = dict(self._pending)
+        return attributes
 
     async def async_set_temperature(self, **kwargs):
         """Set new target temperature."""
@@ -241,44 +296,118 @@ class NatureRemoAC(CoordinatorEntity, ClimateEntity):
         _LOGGER.debug("Set swing mode: %s", swing_mode)
         await self._post({"air_direction": swing_mode})
 
-    async def async_update(self):
-        await self.coordinator.async_request_refresh()
-
-    def _update(self, ac_settings, device=None):
+    def _update(self, ac_settings: AirconSettings, device=None):
         # hold this to determin the ac mode while it's turned-off
-        self._remo_mode = ac_settings["mode"]
+        self._remo_mode = ac_settings.mode
 
-        if len(ac_settings["temp"]) > 0:
-            self._target_temperature = float(ac_settings["temp"])
-            self._last_target_temperature[self._remo_mode] = ac_settings["temp"]
+        if len(ac_settings.temp) > 0:
+            self._target_temperature = float(ac_settings.temp)
+            self._last_target_temperature[self._remo_mode] = ac_settings.temp
         else:
             self._target_temperature = None
 
-        if ac_settings["button"] == MODE_HA_TO_REMO[HVACMode.OFF]:
+        if ac_settings.button == MODE_HA_TO_REMO[HVACMode.OFF]:
             self._hvac_mode = HVACMode.OFF
         else:
             self._hvac_mode = MODE_REMO_TO_HA[self._remo_mode]
 
-        self._fan_mode = ac_settings["vol"] or None
-        self._swing_mode = ac_settings["dir"] or None
+        self._fan_mode = ac_settings.vol or None
+        self._swing_mode = ac_settings.dir or None
 
         if device is not None:
             self._current_temperature = float(device["newest_events"]["te"]["val"])
 
     async def _post(self, data):
-        response = await self.coordinator.async_post(
+        if not self._entry.options.get(CONF_OPTIMISTIC, False):
+            # Wait for the batch and raise its error. Only concurrent calls are
+            # merged; setters called one after the other (an automation, or
+            # set_temperature with an hvac_mode) are each sent on their own.
+            await self._commands.async_submit(data)
+            return
+
+        # Show the requested settings right away and send them in the
+        # background, the response or the next snapshot reconciles them.
+        # Setters called one after the other are merged into one command.
+        self._pending.update(data)
+        self._render()
+        self.coordinator.metrics.record_write()
+        self.async_write_ha_state()
+        self.hass.async_create_task(self._async_send_optimistic(data))
+
+    async def _async_send_optimistic(self, data):
+        try:
+            await self._commands.async_submit(data)
+        except asyncio.CancelledError:
+            return
+        except Exception as error:  # pylint: disable=broad-except
+            _LOGGER.warning("Failed to set %s to %s: %s", self._name, data, error)
+            self._settle(data)
+            persistent_notification.async_create(
+                self.hass,
+                f"Failed to send {data} to {self._name}: {error}",
+                title="Nature Remo",
+                notification_id=f"{DOMAIN}_{self._appliance_id}",
+            )
+            # Roll back to the last confirmed settings
+            self._render()
+            self.coordinator.metrics.record_write()
+            self.async_write_ha_state()
+            return
+        if self._settle(data):
+            # Clear the settled changes from the pending commands attribute
+            self._render()
+            self.coordinator.metrics.record_write()
+            self.async_write_ha_state()
+
+    def _settle(self, data) -> bool:
+        """ Drop sent changes that were not overridden by a newer request """
+        settled = False
+        for key, value in data.items():
+            if self._pending.get(key) == value:
+                del self._pending[key]
+                settled = True
+        return settled
+
+    def _render(self, device=None):
+        """ Show the confirmed settings with the pending changes applied """
+        settings = self._confirmed
+        if self._pending:
+            settings = _apply_command(settings, self._pending)
+        self._update(settings, device)
+
+    async def _async_post_settings(self, data):
+        return await self.coordinator.async_post(
             f"/appliances/{self._appliance_id}/aircon_settings", data
         )
-        self._update(response)
+
+    @core.callback
+    def _apply_response(self, response):
+        self._confirmed = AirconSettings.from_dict(response)
+        # Changes of this batch are settled by the caller once the response
+        # was applied, keep showing them until then.
+        self._render()
+        self.coordinator.metrics.record_write()
         self.async_write_ha_state()
 
-    def _current_mode_temp_range(self):
-        temp_range = self._modes[self._remo_mode]["temp"]
-        return list(map(float, filter(None, temp_range)))
+    async def async_will_remove_from_hass(self) -> None:
+        self._commands.async_cancel()
+        await super().async_will_remove_from_hass()
+
+    def _current_mode_capabilities(self) -> ModeCapabilities:
+        return self._capabilities.per_mode.get(self._remo_mode, NO_CAPABILITIES)
 
     @core.callback
     def _handle_coordinator_update(self) -> None:
-        device = self.coordinator.data[CONF_DEVICES][self._device_id]
-        appliance = self.coordinator.data[CONF_ENTITIES][self._appliance_id]
-        self._update(appliance["settings"], device)
+        if not (self.coordinator.device_changed(self._device_id)
+                or self.coordinator.appliance_changed(self._appliance_id)):
+            return
+        device = self.coordinator.data[CONF_DEVICES].get(self._device_id)
+        appliance = self.coordinator.data[CONF_ENTITIES].get(self._appliance_id)
+        self._available = device is not None and appliance is not None
+        if self._available:
+            if self._capabilities.modes != appliance.modes:
+                self._capabilities = aircon_capabilities(appliance.modes)
+            self._confirmed = appliance.settings
+            self._render(device)
+        self.coordinator.metrics.record_write()
         self.async_write_ha_state()
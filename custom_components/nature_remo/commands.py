@@ -0,0 +1,94 @@
+""" Nature Remo appliance command buffer """
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from homeassistant import core
+from homeassistant.helpers.event import async_call_later
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _conflicts(pending: Dict[str, Any], data: Dict[str, Any]) -> bool:
+    """
+    Return True if data cannot be merged into the pending command.
+    Button commands (power on/off) are always sent on their own so an OFF is
+    never folded into a mode or setting change.
+    """
+    if "button" in pending or "button" in data:
+        return pending != data
+    return False
+
+
+class NatureRemoCommandBuffer():
+    """
+    Per-appliance buffer that merges setting changes into one POST.
+    Changes submitted within the delay window are merged (later values win)
+    and sent as a single request. The response is handed once to on_response
+    and every caller waiting on the batch receives the same result. Batches
+    are posted in submission order.
+    """
+
+    def __init__(self, hass: core.HomeAssistant,
+                 post: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]],
+                 on_response: Callable[[Dict[str, Any]], None],
+                 delay: float):
+        self._hass = hass
+        self._post = post
+        self._on_response = on_response
+        self._delay = delay
+        self._pending: Optional[Dict[str, Any]] = None
+        self._future: Optional[asyncio.Future] = None
+        self._cancel_timer: Optional[Callable[[], None]] = None
+        self._send_lock = asyncio.Lock()
+
+    async def async_submit(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """ Queue data for the next POST and wait for its response """
+        if self._pending is not None and _conflicts(self._pending, data):
+            self._flush()
+
+        if self._pending is None:
+            self._pending = {}
+            self._future = self._hass.loop.create_future()
+            self._cancel_timer = async_call_later(self._hass, self._delay, self._async_timer_fired)
+
+        self._pending.update(data)
+        return await asyncio.shield(self._future)
+
+    @core.callback
+    def async_cancel(self) -> None:
+        """ Drop the pending batch, e.g. when the entity is removed """
+        if self._cancel_timer is not None:
+            self._cancel_timer()
+            self._cancel_timer = None
+        if self._future is not None and not self._future.done():
+            self._future.cancel()
+        self._pending = None
+        self._future = None
+
+    @core.callback
+    def _async_timer_fired(self, _now) -> None:
+        self._cancel_timer = None
+        self._flush()
+
+    def _flush(self) -> None:
+        if self._cancel_timer is not None:
+            self._cancel_timer()
+            self._cancel_timer = None
+        data, future = self._pending, self._future
+        self._pending = None
+        self._future = None
+        self._hass.async_create_task(self._async_send(data, future))
+
+    async def _async_send(self, data: Dict[str, Any], future: asyncio.Future) -> None:
+        async with self._send_lock:
+            _LOGGER.debug("Sending merged command: %s", data)
+            try:
+                response = await self._post(data)
+            except Exception as error:  # pylint: disable=broad-except
+                if not future.done():
+                    future.set_exception(error)
+                return
+            self._on_response(response)
+            if not future.done():
+                future.set_result(response)
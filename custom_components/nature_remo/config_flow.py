@@ -3,14 +3,21 @@ import logging
 from typing import Any, Dict, Optional
 from homeassistant.const import (
     CONF_ACCESS_TOKEN, CONF_DEVICE_ID,
-    CONF_DEVICES, CONF_ENTITIES
+    CONF_HOST, CONF_SCAN_INTERVAL
 )
 from homeassistant import config_entries, core
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
 from . import (NatureRemoApi, NatureRemoApiError, NatureRemoApiCoordinator)
-from .const import (DOMAIN, BASE_URL)
+from .const import (
+    DOMAIN, BASE_URL, CONF_APPLIANCES_INTERVAL, CONF_REFRESH_COOLDOWN, CONF_LOG_PAYLOADS,
+    CONF_MIN_INTERVAL, CONF_MAX_INTERVAL, CONF_MOTION_TIMEOUT, CONF_OPTIMISTIC,
+    CONF_DEADBAND, CONF_MIN_WRITE_INTERVAL, CONF_MAX_SILENCE, SENSOR_DEADBANDS,
+    DEFAULT_MIN_WRITE_INTERVAL, DEFAULT_MAX_SILENCE,
+    DEFAULT_SCAN_INTERVAL, DEFAULT_APPLIANCES_INTERVAL, DEFAULT_REFRESH_COOLDOWN,
+    DEFAULT_MIN_INTERVAL, DEFAULT_MAX_INTERVAL, DEFAULT_MOTION_TIMEOUT
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -18,14 +25,21 @@ _LOGGER = logging.getLogger(__name__)
 class NatureRemoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """ Nature Remo Config Flow """
 
+    VERSION = 2
+
     def __init__(self):
         self._token = ""
         self._discovered_devices = {}
-        self._discovered_entities = {}
         self._coordinator = Any
 
     data: Optional[Dict[str, Any]]
 
+    @staticmethod
+    @core.callback
+    def async_get_options_flow(config_entry: config_entries.ConfigEntry):
+        """ Return the options flow handler """
+        return NatureRemoOptionsFlow(config_entry)
+
     async def async_step_user(self, user_input: Optional[Dict[str, Any]] = None):
         """ Invoked when a user initiates a flow via user interface """
         errors: Dict[str, str] = {}
@@ -67,9 +81,8 @@ class NatureRemoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         try:
             self._discovered_devices = await self._discover_devices()
-            self._discovered_entities = await self._discover_entities()
         except NatureRemoApiError as error:
-            _LOGGER.error("Could not get list of devices/appliances - %s", error)
+            _LOGGER.error("Could not get list of devices - %s", error)
             return self.async_abort(reason="connection_fail")
 
         devices_name = {
@@ -90,21 +103,94 @@ class NatureRemoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """ Discover devices from Nature Remo cloud account """
         return await self._coordinator.async_get_devices()
 
-    async def _discover_entities(self):
-        """ Discover entities (appliances) from Nature Remo cloud account """
-        return await self._coordinator.async_get_appliances()
-
     @core.callback
     def _async_create_entry_from_device(self, device):
         """ Create config entry for Nature Remo device """
         self._abort_if_unique_id_configured(updates={CONF_DEVICE_ID: device["id"]})
-        _LOGGER.info(self._discovered_entities)
+        # Topology is read from the coordinator, only keep what identifies the
+        # device in the entry.
         return self.async_create_entry(
             title=f"{device['name']} {device['serial_number']}",
             data={
                 CONF_ACCESS_TOKEN: self._token,
                 CONF_DEVICE_ID: device["id"],
-                CONF_DEVICES: self._discovered_devices,
-                CONF_ENTITIES: self._discovered_entities
             },
         )
+
+
+class NatureRemoOptionsFlow(config_entries.OptionsFlow):
+    """ Nature Remo Options Flow """
+
+    def __init__(self, config_entry: config_entries.ConfigEntry):
+        self._entry = config_entry
+
+    async def async_step_init(self, user_input: Optional[Dict[str, Any]] = None):
+        """ Manage polling options """
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self._entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema({
+                vol.Required(
+                    CONF_SCAN_INTERVAL,
+                    default=options.get(
+                        CONF_SCAN_INTERVAL, int(DEFAULT_SCAN_INTERVAL.total_seconds())
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=10)),
+                vol.Required(
+                    CONF_APPLIANCES_INTERVAL,
+                    default=options.get(
+                        CONF_APPLIANCES_INTERVAL, int(DEFAULT_APPLIANCES_INTERVAL.total_seconds())
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=60)),
+                vol.Required(
+                    CONF_MIN_INTERVAL,
+                    default=options.get(
+                        CONF_MIN_INTERVAL, int(DEFAULT_MIN_INTERVAL.total_seconds())
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5)),
+                vol.Required(
+                    CONF_MAX_INTERVAL,
+                    default=options.get(
+                        CONF_MAX_INTERVAL, int(DEFAULT_MAX_INTERVAL.total_seconds())
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=10)),
+                vol.Required(
+                    CONF_MOTION_TIMEOUT,
+                    default=options.get(CONF_MOTION_TIMEOUT, DEFAULT_MOTION_TIMEOUT),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Required(
+                    CONF_MIN_WRITE_INTERVAL,
+                    default=options.get(CONF_MIN_WRITE_INTERVAL, DEFAULT_MIN_WRITE_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Required(
+                    CONF_MAX_SILENCE,
+                    default=options.get(CONF_MAX_SILENCE, DEFAULT_MAX_SILENCE),
+                ): vol.All(vol.Coerce(int), vol.Range(min=60)),
+                **{
+                    vol.Required(
+                        CONF_DEADBAND.format(key),
+                        default=options.get(CONF_DEADBAND.format(key), deadband),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0))
+                    for key, deadband in SENSOR_DEADBANDS.items()
+                },
+                vol.Required(
+                    CONF_REFRESH_COOLDOWN,
+                    default=options.get(CONF_REFRESH_COOLDOWN, DEFAULT_REFRESH_COOLDOWN),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Required(
+                    CONF_OPTIMISTIC,
+                    default=options.get(CONF_OPTIMISTIC, False),
+                ): cv.boolean,
+                vol.Required(
+                    CONF_LOG_PAYLOADS,
+                    default=options.get(CONF_LOG_PAYLOADS, False),
+                ): cv.boolean,
+                vol.Optional(
+                    CONF_HOST,
+                    description={"suggested_value": options.get(CONF_HOST)},
+                ): cv.string,
+            }),
+        )
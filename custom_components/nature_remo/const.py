@@ -1,5 +1,7 @@
 """Nature Remo Module Constants"""
+from datetime import timedelta
 
+import aiohttp
 from homeassistant.components.sensor import SensorDeviceClass
 from homeassistant.const import UnitOfTemperature, PERCENTAGE
 
@@ -7,6 +9,66 @@ DOMAIN = "nature_remo"
 BASE_URL = "https://api.nature.global/1"
 COORDINATOR = "nature_remo_coordinator"
 
+# Per-request timeout for cloud calls
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=15)
+# Retries of idempotent GET requests after a transport failure
+REQUEST_RETRIES = 2
+# Base delay (seconds) of the exponential retry backoff
+RETRY_BACKOFF = 1.0
+# Largest response body read from the cloud (bytes)
+MAX_RESPONSE_SIZE = 8 * 1024 * 1024
+
+CONF_APPLIANCES_INTERVAL = "appliances_interval"
+CONF_REFRESH_COOLDOWN = "refresh_cooldown"
+CONF_LOG_PAYLOADS = "log_payloads"
+CONF_MIN_INTERVAL = "min_interval"
+CONF_MAX_INTERVAL = "max_interval"
+CONF_MOTION_TIMEOUT = "motion_timeout"
+CONF_OPTIMISTIC = "optimistic"
+CONF_MIN_WRITE_INTERVAL = "min_write_interval"
+CONF_MAX_SILENCE = "max_silence"
+# Deadband options are named deadband_<sensor key>
+CONF_DEADBAND = "deadband_{}"
+
+DEFAULT_SCAN_INTERVAL = timedelta(seconds=60)
+DEFAULT_APPLIANCES_INTERVAL = timedelta(minutes=30)
+DEFAULT_MIN_INTERVAL = timedelta(seconds=15)
+DEFAULT_MAX_INTERVAL = timedelta(minutes=5)
+# How long polls stay at the minimum interval after a command or motion
+BOOST_DURATION = timedelta(minutes=2)
+# Seconds during which entity refresh requests are merged into one
+DEFAULT_REFRESH_COOLDOWN = 10
+# Seconds after the last motion event before the motion sensor clears
+DEFAULT_MOTION_TIMEOUT = 60
+# Seconds a sensor waits after a write before writing a new reading
+DEFAULT_MIN_WRITE_INTERVAL = 0
+# Seconds after which a reading within the deadband is written anyway
+DEFAULT_MAX_SILENCE = 900
+
+STORAGE_VERSION = 1
+# Seconds to wait before writing a new snapshot to disk
+STORAGE_SAVE_DELAY = 60
+ATTR_SAVED_AT = "saved_at"
+ATTR_RESTORED = "restored_stale"
+
+# Appliance types reported by /appliances
+APPLIANCE_AC = "AC"
+APPLIANCE_TV = "TV"
+APPLIANCE_LIGHT = "LIGHT"
+APPLIANCE_IR = "IR"
+APPLIANCE_SMART_METER = "EL_SMART_METER"
+
+# Path the preset buttons of each appliance type are posted to, also the key
+# of their buttons and state in appliance objects
+BUTTON_PATHS = {
+    APPLIANCE_TV: "tv",
+    APPLIANCE_LIGHT: "light",
+}
+
+# Seconds during which climate setting changes are merged into one command
+COMMAND_COALESCE_DELAY = 0.5
+ATTR_PENDING_COMMANDS = "pending_commands"
+
 SENSOR_NAMES = {
     "hu": "Humidity",
     "il": "Illumination",
@@ -20,6 +82,13 @@ SENSOR_CLASSES = {
     "te": SensorDeviceClass.TEMPERATURE,
 }
 
+# Smallest change of a reading that is written, per sensor key
+SENSOR_DEADBANDS = {
+    "hu": 1,
+    "il": 10,
+    "te": 0.1,
+}
+
 SENSOR_UNITS = {
     "hu": PERCENTAGE,
     "il": "lx",
@@ -0,0 +1,44 @@
+""" Nature Remo diagnostics """
+from typing import Any, Dict
+
+from homeassistant import config_entries, core
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_ACCESS_TOKEN
+
+from . import async_get_coordinator
+
+TO_REDACT = {CONF_ACCESS_TOKEN}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: core.HomeAssistant, entry: config_entries.ConfigEntry
+) -> Dict[str, Any]:
+    """ Return diagnostics for a config entry """
+    coordinator = async_get_coordinator(hass, entry)
+    limiter = coordinator.api.rate_limiter
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "coordinator": {
+            "account": coordinator.account,
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": coordinator.update_interval.total_seconds(),
+            "restored": coordinator.restored,
+            "refresh_requests": coordinator.refresh_requests,
+            "refresh_requests_sent": coordinator.refresh_requests_sent,
+        },
+        "circuit_breaker": {
+            "state": coordinator.api.circuit_breaker.state,
+            "failures": coordinator.api.circuit_breaker.failures,
+            "seconds_until_probe": coordinator.api.circuit_breaker.seconds_until_probe(),
+        },
+        "rate_limit": {
+            "limit": limiter.limit,
+            "remaining": limiter.remaining,
+            "seconds_until_reset": limiter.seconds_until_reset(),
+        },
+        "metrics": coordinator.metrics.as_dict(),
+        "connections": (
+            coordinator.api.connections.as_dict() if coordinator.api.connections else None
+        ),
+    }
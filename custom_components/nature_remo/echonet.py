@@ -0,0 +1,96 @@
+""" ECHONET Lite smart meter property decoding """
+import functools
+import math
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+from .models import EchonetProperty
+
+# Low-voltage smart electric energy meter class (0x0288) properties
+EPC_COEFFICIENT = 0xD3
+EPC_EFFECTIVE_DIGITS = 0xD7
+EPC_CUMULATIVE_ENERGY = 0xE0
+EPC_CUMULATIVE_UNIT = 0xE1
+EPC_INSTANT_POWER = 0xE7
+
+# kWh per cumulative energy count for each unit code (0xE1)
+CUMULATIVE_UNITS = {
+    0x00: 1,
+    0x01: 0.1,
+    0x02: 0.01,
+    0x03: 0.001,
+    0x04: 0.0001,
+    0x0A: 10,
+    0x0B: 100,
+    0x0C: 1000,
+    0x0D: 10000,
+}
+
+
+def meter_values(properties: Iterable[EchonetProperty]) -> Dict[int, int]:
+    """ Return the integer value of each property, skipping unparsable ones """
+    values = {}
+    for prop in properties:
+        try:
+            values[prop.epc] = int(prop.val)
+        except ValueError:
+            continue
+    return values
+
+
+@dataclass(frozen=True, slots=True)
+class MeterProfile:
+    """ Conversion of the raw cumulative energy counter to kWh """
+
+    multiplier: float
+    decimals: int
+    # Raw counter value at which the meter wraps around to 0, 0 if unknown
+    rollover: int
+
+    def energy(self, raw: int) -> float:
+        """ Return the energy in kWh of a raw counter value """
+        return round(raw * self.multiplier, self.decimals)
+
+
+@functools.lru_cache(maxsize=8)
+def meter_profile(coefficient: int, unit: int, digits: Optional[int]) -> MeterProfile:
+    """
+    Return the profile of a meter.
+    Meters report the same coefficient, unit and digits on every reading so
+    profiles are cached and shared.
+    """
+    multiplier = coefficient * CUMULATIVE_UNITS.get(unit, 1)
+    return MeterProfile(
+        multiplier,
+        max(0, -math.floor(math.log10(multiplier))) if multiplier > 0 else 0,
+        10 ** digits if digits else 0,
+    )
+
+
+def meter_profile_of(values: Dict[int, int]) -> MeterProfile:
+    """ Return the profile of the meter reporting the given values """
+    return meter_profile(
+        values.get(EPC_COEFFICIENT, 1),
+        values.get(EPC_CUMULATIVE_UNIT, 0x00),
+        values.get(EPC_EFFECTIVE_DIGITS),
+    )
+
+
+class CumulativeEnergy:
+    """
+    Monotonic kWh total of a meter counter that wraps around.
+    A drop of more than half the counter range is a rollover and the range
+    is added to the offset, smaller drops are meter resets and reported as is.
+    """
+
+    def __init__(self, offset: float = 0.0, last_raw: Optional[int] = None):
+        self.offset = offset
+        self.last_raw = last_raw
+
+    def update(self, profile: MeterProfile, raw: int) -> float:
+        """ Record a raw counter reading and return the total in kWh """
+        if (self.last_raw is not None and profile.rollover
+                and self.last_raw - raw > profile.rollover // 2):
+            self.offset = round(self.offset + profile.energy(profile.rollover), profile.decimals)
+        self.last_raw = raw
+        return round(self.offset + profile.energy(raw), profile.decimals)
@@ -0,0 +1,62 @@
+""" Nature Remo base entities """
+from typing import Any, Dict, Optional
+
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from . import NatureRemoApiCoordinator
+from .const import (DOMAIN, ATTR_RESTORED)
+from .models import Appliance
+
+
+def remo_device_info(device: Dict[str, Any]) -> Dict[str, Any]:
+    """ Return the device registry info of a Remo device """
+    return {
+        "identifiers": {(DOMAIN, device["id"])},
+        "name": device["name"],
+        "manufacturer": "Nature Remo",
+        "model": device["serial_number"],
+        "sw_version": device["firmware_version"],
+    }
+
+
+def appliance_device_info(device: Dict[str, Any], appliance: Appliance) -> Dict[str, Any]:
+    """ Return the device registry info of an appliance, linked to its Remo """
+    return {
+        "identifiers": {(DOMAIN, appliance.id)},
+        "name": appliance.nickname or appliance.model_name,
+        "manufacturer": appliance.manufacturer or "Nature Remo",
+        "model": appliance.model_name,
+        "via_device": (DOMAIN, device["id"]),
+    }
+
+
+class NatureRemoEntity(CoordinatorEntity):
+    """
+    Nature Remo coordinator entity base class.
+    Entities of an appliance belong to the appliance device, the others to
+    the Remo device. Entities are unavailable once their device or appliance
+    left the account and while the coordinator fails updates, which it does
+    while the cloud circuit is open. Entities restored from the cached
+    snapshot stay available until the cloud answered once.
+    """
+
+    def __init__(self, coordinator: NatureRemoApiCoordinator, device: Dict[str, Any],
+                 appliance: Optional[Appliance] = None):
+        super().__init__(coordinator)
+        self._available = True
+        self._device_id = device["id"]
+        if appliance is None:
+            self._attr_device_info = remo_device_info(device)
+        else:
+            self._appliance_id = appliance.id
+            self._attr_device_info = appliance_device_info(device, appliance)
+
+    @property
+    def available(self) -> bool:
+        return self._available and (super().available or self.coordinator.restored)
+
+    @property
+    def extra_state_attributes(self) -> Optional[Dict[str, Any]]:
+        """ Flag states restored from the cached snapshot """
+        if self.coordinator.restored:
+            return {ATTR_RESTORED: True}
+        return None
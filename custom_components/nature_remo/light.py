@@ -0,0 +1,87 @@
+""" Support for Nature Remo lights """
+import logging
+
+from typing import Any, Dict, Optional
+from homeassistant import config_entries, core
+from homeassistant.components.light import (ColorMode, LightEntity)
+from homeassistant.const import CONF_DEVICE_ID, CONF_DEVICES, CONF_ENTITIES
+from . import (NatureRemoApiCoordinator, async_get_coordinator)
+from .const import APPLIANCE_LIGHT
+from .entity import NatureRemoEntity
+from .models import (Appliance, LightState)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: core.HomeAssistant,
+    config_entry: config_entries.ConfigEntry,
+    async_add_entities,
+):
+    """ Setup lights from a config_flow entry """
+    coordinator = async_get_coordinator(hass, config_entry)
+    device_id = config_entry.data[CONF_DEVICE_ID]
+    device = coordinator.data[CONF_DEVICES].get(device_id)
+
+    if device is None:
+        _LOGGER.warning("Device %s not found in Nature Remo account", device_id)
+        return
+
+    async_add_entities(
+        NatureRemoLight(device, appliance, coordinator)
+        for appliance in coordinator.appliances(device_id, APPLIANCE_LIGHT)
+    )
+
+
+class NatureRemoLight(NatureRemoEntity, LightEntity):
+    """
+    Nature Remo IR light.
+    The power state is the one assumed by the cloud from the last button sent.
+    """
+
+    _attr_assumed_state = True
+    _attr_color_mode = ColorMode.ONOFF
+    _attr_supported_color_modes = {ColorMode.ONOFF}
+
+    def __init__(self, device: Dict[str, Any], appliance: Appliance,
+                 coordinator: NatureRemoApiCoordinator):
+        super().__init__(coordinator, device, appliance)
+        self._attr_unique_id = appliance.id
+        self._attr_name = appliance.nickname or appliance.model_name
+        self._buttons = {button.name for button in appliance.buttons}
+        self._update(appliance.light)
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        await self._async_press("on")
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        await self._async_press("off")
+
+    async def _async_press(self, button: str) -> None:
+        # Lights learned with a single toggle button only know "onoff"
+        if button not in self._buttons and "onoff" in self._buttons:
+            button = "onoff"
+        response = await self.coordinator.async_post(
+            f"/appliances/{self._appliance_id}/light", {"button": button}
+        )
+        self._update(LightState(
+            response.get("power") or "",
+            response.get("brightness") or "",
+            response.get("last_button") or "",
+        ))
+        self.coordinator.metrics.record_write()
+        self.async_write_ha_state()
+
+    def _update(self, state: Optional[LightState]) -> None:
+        self._attr_is_on = None if state is None else state.power == "on"
+
+    @core.callback
+    def _handle_coordinator_update(self) -> None:
+        if not self.coordinator.appliance_changed(self._appliance_id):
+            return
+        appliance = self.coordinator.data[CONF_ENTITIES].get(self._appliance_id)
+        self._available = appliance is not None
+        if appliance is not None:
+            self._update(appliance.light)
+        self.coordinator.metrics.record_write()
+        self.async_write_ha_state()
@@ -0,0 +1,72 @@
+""" Nature Remo local (LAN) API """
+import logging
+import time
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+_LOGGER = logging.getLogger(__name__)
+
+# The local API rejects requests without this header
+LOCAL_HEADERS = {"X-Requested-With": "local", "Accept": "application/json"}
+LOCAL_TIMEOUT = aiohttp.ClientTimeout(total=5)
+
+# How long a device that failed to answer is skipped before trying it again
+RETRY_AFTER = 60
+
+
+class NatureRemoLocalApiError(Exception):
+    """ Nature Remo local API error exception """
+
+
+class NatureRemoLocalApi():
+    """
+    Nature Remo local API.
+    Remo devices serve /messages on the LAN. A GET returns the last IR signal
+    received by the device and a POST with the same format blasts it. Only raw
+    IR messages are supported locally; appliance commands such as aircon
+    settings are encoded by the cloud and always go through it.
+    """
+
+    def __init__(self, host: str, session: aiohttp.ClientSession):
+        self.host = host
+        self.session = session
+        self._unreachable_until = 0.0
+
+    @property
+    def url(self) -> str:
+        """ Return the messages endpoint URL """
+        return f"http://{self.host}/messages"
+
+    @property
+    def reachable(self) -> bool:
+        """ Return False while the device is backed off after a failure """
+        return time.monotonic() >= self._unreachable_until
+
+    async def async_get_message(self) -> Dict[str, Any]:
+        """ Return the last IR message received by the device """
+        return await self._request("get")
+
+    async def async_send_message(self, message: Dict[str, Any]) -> None:
+        """ Blast an IR message ({"format": "us", "freq": 38, "data": [...]}) """
+        _LOGGER.info("Sending IR message to %s", self.host)
+        await self._request("post", message)
+
+    async def _request(self, method: str, message: Optional[Dict[str, Any]] = None):
+        try:
+            if method == "post":
+                response = await self.session.post(
+                    self.url, json=message, headers=LOCAL_HEADERS, timeout=LOCAL_TIMEOUT
+                )
+            else:
+                response = await self.session.get(
+                    self.url, headers=LOCAL_HEADERS, timeout=LOCAL_TIMEOUT
+                )
+            response.raise_for_status()
+            json = await response.json() if method == "get" else None
+        except (aiohttp.ClientError, TimeoutError) as error:
+            self._unreachable_until = time.monotonic() + RETRY_AFTER
+            raise NatureRemoLocalApiError(f"{self.host} not reachable: {error}") from error
+
+        self._unreachable_until = 0.0
+        return json
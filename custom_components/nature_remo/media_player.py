@@ -0,0 +1,128 @@
+""" Support for Nature Remo TVs """
+import logging
+
+from typing import Any, Dict
+from homeassistant import config_entries, core
+from homeassistant.components.media_player import (
+    MediaPlayerDeviceClass,
+    MediaPlayerEntity,
+    MediaPlayerEntityFeature,
+    MediaPlayerState,
+)
+from homeassistant.const import CONF_DEVICE_ID, CONF_DEVICES, CONF_ENTITIES
+from homeassistant.helpers.restore_state import RestoreEntity
+from . import (NatureRemoApiCoordinator, async_get_coordinator)
+from .const import APPLIANCE_TV
+from .entity import NatureRemoEntity
+from .models import Appliance
+
+_LOGGER = logging.getLogger(__name__)
+
+# TV buttons backing each media player feature
+BUTTON_FEATURES = {
+    "power": MediaPlayerEntityFeature.TURN_ON | MediaPlayerEntityFeature.TURN_OFF,
+    "vol-up": MediaPlayerEntityFeature.VOLUME_STEP,
+    "mute": MediaPlayerEntityFeature.VOLUME_MUTE,
+    "ch-up": MediaPlayerEntityFeature.NEXT_TRACK,
+    "ch-down": MediaPlayerEntityFeature.PREVIOUS_TRACK,
+}
+
+
+async def async_setup_entry(
+    hass: core.HomeAssistant,
+    config_entry: config_entries.ConfigEntry,
+    async_add_entities,
+):
+    """ Setup TVs from a config_flow entry """
+    coordinator = async_get_coordinator(hass, config_entry)
+    device_id = config_entry.data[CONF_DEVICE_ID]
+    device = coordinator.data[CONF_DEVICES].get(device_id)
+
+    if device is None:
+        _LOGGER.warning("Device %s not found in Nature Remo account", device_id)
+        return
+
+    async_add_entities(
+        NatureRemoTV(device, appliance, coordinator)
+        for appliance in coordinator.appliances(device_id, APPLIANCE_TV)
+    )
+
+
+class NatureRemoTV(NatureRemoEntity, MediaPlayerEntity, RestoreEntity):
+    """
+    Nature Remo IR TV.
+    IR TVs do not report whether they are on and the power button toggles,
+    the state is the one assumed from the last power command sent. It is
+    unknown until a command was sent and restored across restarts.
+    """
+
+    _attr_assumed_state = True
+    _attr_device_class = MediaPlayerDeviceClass.TV
+
+    def __init__(self, device: Dict[str, Any], appliance: Appliance,
+                 coordinator: NatureRemoApiCoordinator):
+        super().__init__(coordinator, device, appliance)
+        self._attr_unique_id = appliance.id
+        self._attr_name = appliance.nickname or appliance.model_name
+        self._attr_state = None
+        self._update(appliance)
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        last = await self.async_get_last_state()
+        if last is not None and last.state in (MediaPlayerState.ON, MediaPlayerState.OFF):
+            self._attr_state = MediaPlayerState(last.state)
+
+    async def async_turn_on(self) -> None:
+        await self._async_press("power")
+        self._async_set_power(MediaPlayerState.ON)
+
+    async def async_turn_off(self) -> None:
+        await self._async_press("power")
+        self._async_set_power(MediaPlayerState.OFF)
+
+    @core.callback
+    def _async_set_power(self, state: MediaPlayerState) -> None:
+        self._attr_state = state
+        self.coordinator.metrics.record_write()
+        self.async_write_ha_state()
+
+    async def async_volume_up(self) -> None:
+        await self._async_press("vol-up")
+
+    async def async_volume_down(self) -> None:
+        await self._async_press("vol-down")
+
+    async def async_mute_volume(self, mute: bool) -> None:
+        await self._async_press("mute")
+
+    async def async_media_next_track(self) -> None:
+        await self._async_press("ch-up")
+
+    async def async_media_previous_track(self) -> None:
+        await self._async_press("ch-down")
+
+    async def _async_press(self, button: str) -> None:
+        await self.coordinator.async_post(
+            f"/appliances/{self._appliance_id}/tv", {"button": button}
+        )
+
+    def _update(self, appliance: Appliance) -> None:
+        buttons = {button.name for button in appliance.buttons}
+        features = MediaPlayerEntityFeature(0)
+        for button, feature in BUTTON_FEATURES.items():
+            if button in buttons:
+                features |= feature
+        self._attr_supported_features = features
+        self._attr_source = appliance.tv.input if appliance.tv else None
+
+    @core.callback
+    def _handle_coordinator_update(self) -> None:
+        if not self.coordinator.appliance_changed(self._appliance_id):
+            return
+        appliance = self.coordinator.data[CONF_ENTITIES].get(self._appliance_id)
+        self._available = appliance is not None
+        if appliance is not None:
+            self._update(appliance)
+        self.coordinator.metrics.record_write()
+        self.async_write_ha_state()
@@ -0,0 +1,122 @@
+""" Nature Remo API client metrics """
+import bisect
+from typing import Any, Dict, List
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def endpoint_name(method: str, path: str) -> str:
+    """ Return the endpoint of a request with ids replaced by a placeholder """
+    parts = path.split("/")
+    if len(parts) > 3:
+        # /appliances/<id>/aircon_settings, /signals/<id>/send
+        parts[2] = "{id}"
+    return f"{method.upper()} {'/'.join(parts)}"
+
+
+class Histogram():
+    """ Fixed bucket histogram """
+
+    __slots__ = ("counts", "count", "total")
+
+    def __init__(self):
+        self.counts: List[int] = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def record(self, value: float) -> None:
+        """ Add one observation """
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def as_dict(self) -> Dict[str, Any]:
+        """ Return the histogram as a serializable dict """
+        buckets = {f"le_{bound}": count for bound, count in zip(LATENCY_BUCKETS, self.counts)}
+        buckets["le_inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "buckets": buckets,
+        }
+
+
+class EndpointMetrics():
+    """ Metrics of a single endpoint """
+
+    __slots__ = ("requests", "errors", "bytes_received", "latency")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.bytes_received = 0
+        self.latency = Histogram()
+
+    def as_dict(self) -> Dict[str, Any]:
+        """ Return the metrics as a serializable dict """
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "bytes_received": self.bytes_received,
+            "latency": self.latency.as_dict(),
+        }
+
+
+class NatureRemoMetrics():
+    """
+    Counters for the API client hot path.
+    Recording is a handful of integer operations so it is always on.
+    """
+
+    def __init__(self):
+        self.endpoints: Dict[str, EndpointMetrics] = {}
+        self.decode = Histogram()
+        self.update_duration = Histogram()
+        self.last_update_duration = None
+        self.entity_writes = 0
+        self.suppressed_writes = 0
+
+    def record_request(self, endpoint: str, latency: float, size: int, error: bool = False) -> None:
+        """ Record one request """
+        metrics = self.endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self.endpoints[endpoint] = EndpointMetrics()
+        metrics.requests += 1
+        metrics.bytes_received += size
+        metrics.latency.record(latency)
+        if error:
+            metrics.errors += 1
+
+    def record_decode(self, seconds: float) -> None:
+        """ Record the time spent decoding a JSON body """
+        self.decode.record(seconds)
+
+    def record_update(self, seconds: float) -> None:
+        """ Record the duration of a coordinator update """
+        self.last_update_duration = seconds
+        self.update_duration.record(seconds)
+
+    def record_write(self) -> None:
+        """ Record an entity state write """
+        self.entity_writes += 1
+
+    def record_suppressed(self) -> None:
+        """ Record a changed reading that was not written (deadband) """
+        self.suppressed_writes += 1
+
+    @property
+    def total_requests(self) -> int:
+        """ Return the number of requests sent to the cloud """
+        return sum(metrics.requests for metrics in self.endpoints.values())
+
+    def as_dict(self) -> Dict[str, Any]:
+        """ Return all metrics as a serializable dict """
+        return {
+            "endpoints": {name: metrics.as_dict() for name, metrics in self.endpoints.items()},
+            "json_decode": self.decode.as_dict(),
+            "update_duration": self.update_duration.as_dict(),
+            "last_update_duration": self.last_update_duration,
+            "entity_writes": self.entity_writes,
+            "suppressed_writes": self.suppressed_writes,
+        }
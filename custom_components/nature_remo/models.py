@@ -0,0 +1,326 @@
+""" Nature Remo compact appliance records """
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from homeassistant.util.json import json_loads
+
+from .const import BUTTON_PATHS
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover
+    msgspec = None
+
+
+@dataclass(frozen=True, slots=True)
+class AirconSettings:
+    """ Current aircon settings """
+
+    temp: str
+    mode: str
+    vol: str
+    dir: str
+    button: str
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AirconSettings":
+        """ Build settings from an API settings object """
+        return cls(
+            data.get("temp") or "",
+            data.get("mode") or "",
+            data.get("vol") or "",
+            data.get("dir") or "",
+            data.get("button") or "",
+        )
+
+    def as_dict(self) -> Dict[str, str]:
+        """ Return the settings in API format """
+        return {
+            "temp": self.temp,
+            "mode": self.mode,
+            "vol": self.vol,
+            "dir": self.dir,
+            "button": self.button,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class AirconMode:
+    """ Temperatures, fan speeds and swing directions of an aircon mode """
+
+    temp: Tuple[str, ...]
+    vol: Tuple[str, ...]
+    dir: Tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class Signal:
+    """ Learned IR signal """
+
+    id: str
+    name: str
+
+
+@dataclass(frozen=True, slots=True)
+class Button:
+    """ Preset button of a TV or light """
+
+    name: str
+    label: str
+
+
+@dataclass(frozen=True, slots=True)
+class LightState:
+    """ Last known light state, as assumed by the cloud """
+
+    power: str
+    brightness: str
+    last_button: str
+
+
+@dataclass(frozen=True, slots=True)
+class TvState:
+    """ Last known TV state, as assumed by the cloud """
+
+    input: str
+
+
+@dataclass(frozen=True, slots=True)
+class EchonetProperty:
+    """ ECHONET Lite property reported by a smart meter """
+
+    epc: int
+    val: str
+    updated_at: str
+
+
+@dataclass(frozen=True, slots=True)
+class Appliance:
+    """
+    Appliance projected to the fields the platforms use.
+    Images and other presentation fields are dropped when decoding.
+    """
+
+    id: str
+    type: str
+    device_id: str
+    nickname: str
+    model_name: str
+    manufacturer: str
+    settings: Optional[AirconSettings] = None
+    modes: Tuple[Tuple[str, AirconMode], ...] = ()
+    signals: Tuple[Signal, ...] = ()
+    buttons: Tuple[Button, ...] = ()
+    light: Optional[LightState] = None
+    tv: Optional[TvState] = None
+    echonet: Tuple[EchonetProperty, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Appliance":
+        """ Build a record from an API appliance object """
+        model = data.get("model") or {}
+        settings = data.get("settings")
+        aircon = data.get("aircon") or {}
+        modes = (aircon.get("range") or {}).get("modes") or {}
+        light = data.get("light") or {}
+        tv = data.get("tv") or {}
+        smart_meter = data.get("smart_meter") or {}
+        light_state = light.get("state")
+        tv_state = tv.get("state")
+        return cls(
+            data["id"],
+            data.get("type") or "",
+            data["device"]["id"],
+            data.get("nickname") or "",
+            model.get("name") or "",
+            model.get("manufacturer") or "",
+            AirconSettings.from_dict(settings) if settings else None,
+            tuple(
+                (name, AirconMode(
+                    tuple(mode.get("temp") or ()),
+                    tuple(mode.get("vol") or ()),
+                    tuple(mode.get("dir") or ()),
+                ))
+                for name, mode in modes.items()
+            ),
+            tuple(
+                Signal(signal["id"], signal.get("name") or "")
+                for signal in data.get("signals") or ()
+            ),
+            tuple(
+                Button(button["name"], button.get("label") or "")
+                for button in light.get("buttons") or tv.get("buttons") or ()
+            ),
+            LightState(
+                light_state.get("power") or "",
+                light_state.get("brightness") or "",
+                light_state.get("last_button") or "",
+            ) if light_state else None,
+            TvState(tv_state.get("input") or "") if tv_state else None,
+            tuple(
+                EchonetProperty(prop["epc"], prop.get("val") or "", prop.get("updated_at") or "")
+                for prop in smart_meter.get("echonetlite_properties") or ()
+            ),
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        """ Return the record in (trimmed) API format """
+        data: Dict[str, Any] = {
+            "id": self.id,
+            "type": self.type,
+            "device": {"id": self.device_id},
+            "nickname": self.nickname,
+            "model": {"name": self.model_name, "manufacturer": self.manufacturer},
+        }
+        if self.settings is not None:
+            data["settings"] = self.settings.as_dict()
+        if self.modes:
+            data["aircon"] = {"range": {"modes": {
+                name: {"temp": list(mode.temp), "vol": list(mode.vol), "dir": list(mode.dir)}
+                for name, mode in self.modes
+            }}}
+        if self.signals:
+            data["signals"] = [{"id": signal.id, "name": signal.name} for signal in self.signals]
+        buttons = [{"name": button.name, "label": button.label} for button in self.buttons]
+        for appliance_type, key in BUTTON_PATHS.items():
+            state = getattr(self, key)
+            if state is not None or self.type == appliance_type:
+                data[key] = {"buttons": buttons}
+                if state is not None:
+                    data[key]["state"] = asdict(state)
+                break
+        if self.echonet:
+            data["smart_meter"] = {"echonetlite_properties": [
+                {"epc": prop.epc, "val": prop.val, "updated_at": prop.updated_at}
+                for prop in self.echonet
+            ]}
+        return data
+
+
+if msgspec is not None:
+    class _ModelStruct(msgspec.Struct):
+        name: Optional[str] = None
+        manufacturer: Optional[str] = None
+
+    class _DeviceStruct(msgspec.Struct):
+        id: str
+
+    class _ModeStruct(msgspec.Struct):
+        temp: Tuple[str, ...] = ()
+        vol: Tuple[str, ...] = ()
+        dir: Tuple[str, ...] = ()
+
+    class _RangeStruct(msgspec.Struct):
+        modes: Dict[str, _ModeStruct] = {}
+
+    class _AirconStruct(msgspec.Struct):
+        range: Optional[_RangeStruct] = None
+
+    class _SettingsStruct(msgspec.Struct):
+        temp: Optional[str] = None
+        mode: Optional[str] = None
+        vol: Optional[str] = None
+        dir: Optional[str] = None
+        button: Optional[str] = None
+
+    class _SignalStruct(msgspec.Struct):
+        id: str
+        name: Optional[str] = None
+
+    class _ButtonStruct(msgspec.Struct):
+        name: str
+        label: Optional[str] = None
+
+    class _LightStateStruct(msgspec.Struct):
+        power: Optional[str] = None
+        brightness: Optional[str] = None
+        last_button: Optional[str] = None
+
+    class _LightStruct(msgspec.Struct):
+        buttons: Tuple[_ButtonStruct, ...] = ()
+        state: Optional[_LightStateStruct] = None
+
+    class _TvStateStruct(msgspec.Struct):
+        input: Optional[str] = None
+
+    class _TvStruct(msgspec.Struct):
+        buttons: Tuple[_ButtonStruct, ...] = ()
+        state: Optional[_TvStateStruct] = None
+
+    class _EchonetStruct(msgspec.Struct):
+        epc: int
+        val: Optional[str] = None
+        updated_at: Optional[str] = None
+
+    class _SmartMeterStruct(msgspec.Struct):
+        echonetlite_properties: Tuple[_EchonetStruct, ...] = ()
+
+    class _ApplianceStruct(msgspec.Struct):
+        # Fields not declared here (images...) are skipped by the decoder
+        # without being turned into Python objects.
+        id: str
+        device: _DeviceStruct
+        type: Optional[str] = None
+        nickname: Optional[str] = None
+        model: Optional[_ModelStruct] = None
+        settings: Optional[_SettingsStruct] = None
+        aircon: Optional[_AirconStruct] = None
+        signals: Tuple[_SignalStruct, ...] = ()
+        light: Optional[_LightStruct] = None
+        tv: Optional[_TvStruct] = None
+        smart_meter: Optional[_SmartMeterStruct] = None
+
+    _APPLIANCES_DECODER = msgspec.json.Decoder(Tuple[_ApplianceStruct, ...])
+
+    def _from_struct(item: "_ApplianceStruct") -> Appliance:
+        settings = item.settings
+        model = item.model or _ModelStruct()
+        modes = item.aircon.range.modes if item.aircon and item.aircon.range else {}
+        light = item.light or _LightStruct()
+        tv = item.tv or _TvStruct()
+        meter = item.smart_meter or _SmartMeterStruct()
+        return Appliance(
+            item.id,
+            item.type or "",
+            item.device.id,
+            item.nickname or "",
+            model.name or "",
+            model.manufacturer or "",
+            AirconSettings(
+                settings.temp or "", settings.mode or "", settings.vol or "",
+                settings.dir or "", settings.button or "",
+            ) if settings else None,
+            tuple(
+                (name, AirconMode(mode.temp, mode.vol, mode.dir))
+                for name, mode in modes.items()
+            ),
+            tuple(Signal(signal.id, signal.name or "") for signal in item.signals),
+            tuple(
+                Button(button.name, button.label or "")
+                for button in light.buttons or tv.buttons
+            ),
+            LightState(
+                light.state.power or "", light.state.brightness or "",
+                light.state.last_button or "",
+            ) if light.state else None,
+            TvState(tv.state.input or "") if tv.state else None,
+            tuple(
+                EchonetProperty(prop.epc, prop.val or "", prop.updated_at or "")
+                for prop in meter.echonetlite_properties
+            ),
+        )
+
+
+def decode_appliances(body: bytes) -> Tuple[Appliance, ...]:
+    """
+    Decode an /appliances response into compact records.
+    Uses msgspec to skip unused fields while parsing when it is installed,
+    otherwise the body is decoded with orjson and projected.
+    """
+    if msgspec is not None:
+        try:
+            items = _APPLIANCES_DECODER.decode(body)
+        except msgspec.MsgspecError as error:
+            raise ValueError(str(error)) from error
+        return tuple(_from_struct(item) for item in items)
+    return tuple(Appliance.from_dict(item) for item in json_loads(body))
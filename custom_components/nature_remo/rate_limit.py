@@ -0,0 +1,149 @@
+""" Nature Remo cloud API rate limiting """
+import asyncio
+import contextlib
+import logging
+import time
+from datetime import timedelta
+from typing import Iterator, Mapping, Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+HEADER_LIMIT = "X-Rate-Limit-Limit"
+HEADER_REMAINING = "X-Rate-Limit-Remaining"
+HEADER_RESET = "X-Rate-Limit-Reset"
+
+# Nature cloud allows 30 requests every 5 minutes per token
+DEFAULT_LIMIT = 30
+DEFAULT_WINDOW = 300
+
+# Requests kept aside for user commands. Polls are skipped once the remaining
+# budget falls to this value so commands are never starved.
+COMMAND_RESERVE = 5
+
+PRIORITY_COMMAND = 0
+PRIORITY_POLL = 1
+
+
+class NatureRemoRateLimiter():
+    """
+    Token bucket scheduler for the Nature Remo cloud API.
+    The bucket is refilled from the X-Rate-Limit-* headers returned by the
+    cloud and consumed locally between responses. Without a reset header the
+    window starts with the first request, so the bucket also refills when
+    the cloud does not answer. Commands (POST) always get a
+    token, waiting for the window reset if needed, and background polls wait
+    until no command is pending. Polls are refused when the remaining budget
+    is at or below the command reserve.
+    """
+
+    def __init__(self, limit: int = DEFAULT_LIMIT, window: int = DEFAULT_WINDOW,
+                 reserve: int = COMMAND_RESERVE):
+        self.limit = limit
+        self.remaining = limit
+        self.reset: Optional[float] = None
+        self._window = window
+        self._reserve = reserve
+        self._pending_commands = 0
+        self._commands_idle = asyncio.Event()
+        self._commands_idle.set()
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """ Update the bucket from response headers """
+        try:
+            if HEADER_LIMIT in headers:
+                self.limit = int(headers[HEADER_LIMIT])
+            if HEADER_REMAINING in headers:
+                self.remaining = int(headers[HEADER_REMAINING])
+            if HEADER_RESET in headers:
+                self.reset = float(headers[HEADER_RESET])
+        except ValueError:
+            _LOGGER.debug("Ignoring malformed rate limit headers: %s", headers)
+
+    def exhaust(self, reset: Optional[float] = None) -> None:
+        """ Mark the budget as used up, e.g. after a 429 response """
+        self.remaining = 0
+        if reset is not None:
+            self.reset = reset
+        elif self.reset is None:
+            self.reset = time.time() + self._window
+
+    def seconds_until_reset(self) -> float:
+        """ Return seconds until the current window resets """
+        if self.reset is None:
+            return 0.0
+        return max(0.0, self.reset - time.time())
+
+    def _refill(self) -> None:
+        if self.reset is not None and time.time() >= self.reset:
+            self.remaining = self.limit
+            self.reset = None
+
+    def _take(self) -> None:
+        # Until a response reports the window, count it from the first request
+        # so tokens spent while the cloud does not answer come back.
+        if self.reset is None:
+            self.reset = time.time() + self._window
+        self.remaining -= 1
+
+    async def async_acquire(self, priority: int) -> bool:
+        """
+        Take one token from the bucket.
+        Commands wait until a token is available and always return True. Polls
+        wait for pending commands and return False when the poll should be
+        skipped to keep budget for commands.
+        """
+        if priority == PRIORITY_COMMAND:
+            return await self._async_acquire_command()
+
+        await self._commands_idle.wait()
+        self._refill()
+        if self.remaining <= self._reserve:
+            _LOGGER.debug("Rate limit budget low (%d left), skipping poll", self.remaining)
+            return False
+        self._take()
+        return True
+
+    async def _async_acquire_command(self) -> bool:
+        with self.hold_polls():
+            self._refill()
+            while self.remaining <= 0:
+                delay = self.seconds_until_reset() or 1.0
+                _LOGGER.info("Rate limit reached, delaying command %.0f seconds", delay)
+                await asyncio.sleep(delay)
+                self._refill()
+            self._take()
+            return True
+
+    def fits(self, count: int) -> bool:
+        """ Return True if count commands can be sent before the window resets """
+        self._refill()
+        return count <= self.remaining
+
+    @contextlib.contextmanager
+    def hold_polls(self) -> Iterator[None]:
+        """ Keep polls waiting while commands are being sent """
+        self._pending_commands += 1
+        self._commands_idle.clear()
+        try:
+            yield
+        finally:
+            self._pending_commands -= 1
+            if self._pending_commands == 0:
+                self._commands_idle.set()
+
+    def stretch_interval(self, interval: timedelta, requests_per_poll: int = 1) -> timedelta:
+        """
+        Return the poll interval needed to stay within the remaining budget.
+        The interval is never shorter than the given one and leaves the command
+        reserve untouched until the window resets.
+        """
+        until_reset = self.seconds_until_reset()
+        if until_reset <= 0:
+            return interval
+
+        usable = self.remaining - self._reserve
+        if usable < requests_per_poll:
+            return max(interval, timedelta(seconds=until_reset))
+
+        needed = until_reset / (usable / requests_per_poll)
+        return max(interval, timedelta(seconds=needed))
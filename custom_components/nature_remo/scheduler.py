@@ -0,0 +1,52 @@
+""" Nature Remo multi-account poll scheduler """
+import math
+import time
+from datetime import timedelta
+from typing import List
+
+
+class NatureRemoPollScheduler():
+    """
+    Staggers the polls of several accounts.
+    Each account gets a phase offset so that N accounts polling at the same
+    interval are spread evenly over it instead of all firing together. Offsets
+    are recomputed when accounts are added or removed and coordinators pick up
+    their new slot on the next poll.
+    """
+
+    def __init__(self):
+        self._anchor = time.monotonic()
+        self._accounts: List[str] = []
+
+    def add(self, account: str) -> None:
+        """ Add an account to the schedule """
+        if account not in self._accounts:
+            self._accounts.append(account)
+
+    def remove(self, account: str) -> None:
+        """ Remove an account from the schedule """
+        if account in self._accounts:
+            self._accounts.remove(account)
+
+    def phase(self, account: str, period: float) -> float:
+        """ Return the offset (seconds) of the account inside the period """
+        if account not in self._accounts:
+            return 0.0
+        return self._accounts.index(account) * period / len(self._accounts)
+
+    def align(self, account: str, interval: timedelta) -> timedelta:
+        """
+        Return the delay until the next poll slot of the account.
+        The slot is the one closest to an interval away, so consecutive polls
+        land on consecutive slots one interval apart whatever time the poll
+        itself took. The delay is between half and one and a half intervals.
+        """
+        period = interval.total_seconds()
+        if period <= 0 or len(self._accounts) < 2:
+            return interval
+
+        now = time.monotonic()
+        offset = self._anchor + self.phase(account, period)
+        earliest = now + period / 2
+        slot = offset + math.ceil((earliest - offset) / period) * period
+        return timedelta(seconds=slot - now)
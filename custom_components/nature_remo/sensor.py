@@ -1,20 +1,96 @@
 """ Support for Nature Remo Sensors """
+import abc
 import logging
-from datetime import (datetime, timezone, timedelta)
-from typing import Any, Dict
-from dateutil import parser
+import time
+from datetime import timedelta
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
 from homeassistant import config_entries, core
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.const import (CONF_DEVICE_ID, CONF_DEVICES)
-from homeassistant.components.sensor import (SensorEntity, SensorStateClass)
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.restore_state import (ExtraStoredData, RestoreEntity)
+from homeassistant.const import (
+    CONF_ACCESS_TOKEN, CONF_DEVICE_ID, CONF_DEVICES, CONF_ENTITIES, PERCENTAGE, EntityCategory,
+    UnitOfEnergy, UnitOfPower, UnitOfTime
+)
+from homeassistant.components.sensor import (SensorDeviceClass, SensorEntity, SensorStateClass)
 from homeassistant.components.binary_sensor import (BinarySensorEntity, BinarySensorDeviceClass)
-from . import (NatureRemoApiCoordinator)
-from .const import (DOMAIN, COORDINATOR, SENSOR_NAMES, SENSOR_UNITS, SENSOR_CLASSES)
+from homeassistant.util import dt as dt_util
+from . import (NatureRemoApiCoordinator, async_get_coordinator)
+from .entity import NatureRemoEntity
+from .echonet import (
+    EPC_CUMULATIVE_ENERGY, EPC_INSTANT_POWER, CumulativeEnergy, meter_profile_of, meter_values
+)
+from .models import Appliance
+from .const import (
+    DOMAIN, APPLIANCE_SMART_METER, CONF_MOTION_TIMEOUT, DEFAULT_MOTION_TIMEOUT,
+    CONF_DEADBAND, CONF_MIN_WRITE_INTERVAL, CONF_MAX_SILENCE, SENSOR_DEADBANDS,
+    DEFAULT_MIN_WRITE_INTERVAL, DEFAULT_MAX_SILENCE,
+    SENSOR_NAMES, SENSOR_UNITS, SENSOR_CLASSES
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 SCAN_INTERVAL = timedelta(seconds=60)
 
+METRIC_SENSORS = {
+    "rate_limit_remaining": (
+        "Rate Limit Remaining",
+        None,
+        lambda coordinator: coordinator.api.rate_limiter.remaining,
+    ),
+    "update_duration": (
+        "Update Duration",
+        UnitOfTime.SECONDS,
+        lambda coordinator: coordinator.metrics.last_update_duration,
+    ),
+    "poll_interval": (
+        "Poll Interval",
+        UnitOfTime.SECONDS,
+        lambda coordinator: coordinator.update_interval.total_seconds(),
+    ),
+    "cloud_requests": (
+        "Cloud Requests",
+        None,
+        lambda coordinator: coordinator.metrics.total_requests,
+    ),
+    "entity_writes": (
+        "Entity Writes",
+        None,
+        lambda coordinator: coordinator.metrics.entity_writes,
+    ),
+    "suppressed_writes": (
+        "Suppressed Writes",
+        None,
+        lambda coordinator: coordinator.metrics.suppressed_writes,
+    ),
+    "connection_reuse": (
+        "Connection Reuse",
+        PERCENTAGE,
+        lambda coordinator: (
+            None if coordinator.api.connections.reuse_rate is None
+            else round(coordinator.api.connections.reuse_rate * 100, 1)
+        ),
+    ),
+    "tls_handshakes": (
+        "TLS Handshakes",
+        None,
+        lambda coordinator: coordinator.api.connections.tls_handshakes,
+    ),
+}
+
+
+def _owns_metrics(hass: core.HomeAssistant, config_entry: config_entries.ConfigEntry) -> bool:
+    """
+    Return True if the entry adds the metric sensors of its account.
+    The coordinator is shared by the entries of an account, its metrics are
+    added once, to the oldest enabled entry whatever order entries load in.
+    """
+    token = config_entry.data[CONF_ACCESS_TOKEN]
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        if entry.data.get(CONF_ACCESS_TOKEN) == token and entry.disabled_by is None:
+            return entry.entry_id == config_entry.entry_id
+    return False
+
 
 async def async_setup_entry(
     hass: core.HomeAssistant,
@@ -22,28 +98,48 @@ async def async_setup_entry(
     async_add_entities,
 ):
     """ Setup sensors from a config_flow entry """
-    config = hass.data[DOMAIN][config_entry.entry_id]
-    coordinator = hass.data[DOMAIN][COORDINATOR]
-    device_id = config[CONF_DEVICE_ID]
-    device = config[CONF_DEVICES][device_id]
+    coordinator = async_get_coordinator(hass, config_entry)
+    device_id = config_entry.data[CONF_DEVICE_ID]
+    device = coordinator.data[CONF_DEVICES].get(device_id)
     sensors = []
 
+    if device is None:
+        _LOGGER.warning("Device %s not found in Nature Remo account", device_id)
+        return
+
     for sensor in device["newest_events"]:
         # Motion sensor is a different type so skipped here.
         if sensor != 'mo':
-            sensors.append(NatureSensor(device, sensor, coordinator))
+            sensors.append(NatureSensor(device, sensor, coordinator, config_entry))
 
     if "mo" in device["newest_events"]:
-        sensors.append(NatureMotionSensor(device, "mo", coordinator))
+        sensors.append(NatureMotionSensor(device, "mo", coordinator, config_entry))
+
+    for appliance in coordinator.appliances(device_id, APPLIANCE_SMART_METER):
+        sensors.append(NatureRemoPowerSensor(device, appliance, coordinator))
+        sensors.append(NatureRemoEnergySensor(device, appliance, coordinator))
 
-    async_add_entities(sensors, update_before_add=True)
+    if _owns_metrics(hass, config_entry):
+        for metric in METRIC_SENSORS:
+            sensors.append(NatureRemoMetricSensor(device, metric, coordinator))
 
+    async_add_entities(sensors)
 
-class NatureSensor(CoordinatorEntity, SensorEntity):
-    """ Nature Sensor Class """
 
-    def __init__(self, device: Dict[str, Any], sensor: str, coordinator: NatureRemoApiCoordinator):
-        super().__init__(coordinator)
+class NatureSensor(NatureRemoEntity, SensorEntity):
+    """
+    Nature Sensor Class
+    Readings that moved less than the deadband of the sensor, or that arrive
+    within the minimum write interval, are not written unless nothing was
+    written for the maximum silence period.
+    """
+
+    def __init__(self, device: Dict[str, Any], sensor: str, coordinator: NatureRemoApiCoordinator,
+                 config_entry: config_entries.ConfigEntry):
+        super().__init__(coordinator, device)
+        self._entry = config_entry
+        self._written_at = 0.0
+        self._written_flags = None
         self._id = f"{device['id']}-{sensor}"
         self._sensor = sensor
         self._name = f"{device['name']} {SENSOR_NAMES[sensor]} Sensor"
@@ -51,11 +147,6 @@ class NatureSensor(CoordinatorEntity, SensorEntity):
         self._attr_native_unit_of_measurement = SENSOR_UNITS[sensor]
         self._attr_device_class = SENSOR_CLASSES[sensor]
         self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._available = True
-        self._device_id = device['id']
-        self._device_name = device['name']
-        self._serial_number = device["serial_number"]
-        self._firmware_version = device["firmware_version"]
 
     @property
     def name(self) -> str:
@@ -65,53 +156,79 @@ class NatureSensor(CoordinatorEntity, SensorEntity):
     def unique_id(self) -> str:
         return self._id
 
-    @property
-    def available(self) -> bool:
-        return self._available
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self._written_at = time.monotonic()
+        self._written_flags = (self.available, self.coordinator.restored)
 
-    @property
-    def device_info(self):
-        return {
-            "identifiers": {(DOMAIN, self._device_id)},
-            "name": self._device_name,
-            "manufacturer": "Nature Remo",
-            "model": self._serial_number,
-            "sw_version": self._firmware_version,
-        }
-
-    async def async_update(self):
-        """ Update sensor """
-        await self.coordinator.async_request_refresh()
+    def _should_write(self, value) -> bool:
+        """ Return False if the reading is within the deadband or too early """
+        if (self.available, self.coordinator.restored) != self._written_flags:
+            return True
+        if value == self._attr_native_value:
+            return False
+        options = self._entry.options
+        elapsed = time.monotonic() - self._written_at
+        if elapsed >= options.get(CONF_MAX_SILENCE, DEFAULT_MAX_SILENCE):
+            return True
+        if elapsed < options.get(CONF_MIN_WRITE_INTERVAL, DEFAULT_MIN_WRITE_INTERVAL):
+            self.coordinator.metrics.record_suppressed()
+            return False
+        deadband = options.get(
+            CONF_DEADBAND.format(self._sensor), SENSOR_DEADBANDS.get(self._sensor, 0)
+        )
+        # Rounded so float noise does not push a change just below the deadband
+        if round(abs(value - self._attr_native_value), 6) < deadband:
+            self.coordinator.metrics.record_suppressed()
+            return False
+        return True
 
     @core.callback
     def _handle_coordinator_update(self) -> None:
-        device = self.coordinator.data[CONF_DEVICES][self._device_id]
-        self._attr_native_value = device["newest_events"][self._sensor]["val"]
-        self._available = True
+        if not self.coordinator.device_changed(self._device_id):
+            return
+        device = self.coordinator.data[CONF_DEVICES].get(self._device_id)
+        self._available = device is not None
+        if device is None:
+            value = self._attr_native_value
+        else:
+            value = device["newest_events"][self._sensor]["val"]
+        if not self._should_write(value):
+            return
+        self._attr_native_value = value
         _LOGGER.debug("Update sensor %s with %s", self._sensor, self._attr_native_value)
+        self._written_at = time.monotonic()
+        self._written_flags = (self.available, self.coordinator.restored)
+        self.coordinator.metrics.record_write()
         self.async_write_ha_state()
 
 
-class NatureMotionSensor(CoordinatorEntity, BinarySensorEntity):
+class NatureMotionSensor(NatureRemoEntity, BinarySensorEntity):
     """
     Nature Remo Motion Sensor
     The sensor value is always one. Whenever motion is detected the created_at
-    field is updated. To determine motion we check if no updates happened in 1
-    minute.
+    field is updated. The sensor turns on when a new event arrives and a timer
+    clears it once the configured timeout elapsed without further events.
     """
 
-    def __init__(self, device: Dict[str, Any], sensor: str, coordinator: NatureRemoApiCoordinator):
-        super().__init__(coordinator)
+    def __init__(
+        self,
+        device: Dict[str, Any],
+        sensor: str,
+        coordinator: NatureRemoApiCoordinator,
+        config_entry: config_entries.ConfigEntry,
+    ):
+        super().__init__(coordinator, device)
         self._id = f"{device['id']}-{sensor}"
         self._sensor = sensor
         self._name = f"{device['name']} {SENSOR_NAMES[sensor]} Sensor"
-        self._last_update = parser.parse(device["newest_events"][self._sensor]["created_at"])
+        self._entry = config_entry
+        self._created_at = None
+        self._last_update = None
+        self._cancel_clear = None
+        self._set_event(device["newest_events"][self._sensor]["created_at"])
         self._attr_device_class = BinarySensorDeviceClass.MOTION
-        self._available = True
-        self._device_id = device['id']
-        self._device_name = device['name']
-        self._serial_number = device["serial_number"]
-        self._firmware_version = device["firmware_version"]
+        self._attr_is_on = False
 
     @property
     def name(self) -> str:
@@ -122,32 +239,193 @@ class NatureMotionSensor(CoordinatorEntity, BinarySensorEntity):
         return self._id
 
     @property
-    def available(self) -> bool:
-        return self._available
+    def _timeout(self) -> timedelta:
+        # Read on every event so option changes apply without a reload
+        return timedelta(
+            seconds=self._entry.options.get(CONF_MOTION_TIMEOUT, DEFAULT_MOTION_TIMEOUT)
+        )
 
-    @property
-    def is_on(self) -> bool:
-        now = datetime.now(timezone.utc)
-        elapsed = (now - self._last_update).seconds
-        return elapsed < 60
+    def _set_event(self, created_at: str) -> bool:
+        """ Parse the event timestamp, returns False if it did not change """
+        if created_at == self._created_at:
+            return False
+        self._created_at = created_at
+        self._last_update = dt_util.parse_datetime(created_at)
+        return True
 
-    @property
-    def device_info(self):
-        return {
-            "identifiers": {(DOMAIN, self._device_id)},
-            "name": self._device_name,
-            "manufacturer": "Nature Remo",
-            "model": self._serial_number,
-            "sw_version": self._firmware_version,
-        }
+    @core.callback
+    def _async_schedule_clear(self) -> None:
+        """ Turn on until the timeout after the last event and arm the clear timer """
+        if self._cancel_clear is not None:
+            self._cancel_clear()
+            self._cancel_clear = None
+        if self._last_update is None:
+            self._attr_is_on = False
+            return
+        remaining = (self._last_update + self._timeout - dt_util.utcnow()).total_seconds()
+        self._attr_is_on = remaining > 0
+        if self._attr_is_on:
+            self._cancel_clear = async_call_later(self.hass, remaining, self._async_clear)
 
-    async def async_update(self):
-        """ Update sensor"""
-        await self.coordinator.async_request_refresh()
+    @core.callback
+    def _async_clear(self, _now) -> None:
+        self._cancel_clear = None
+        self._attr_is_on = False
+        self.coordinator.metrics.record_write()
+        self.async_write_ha_state()
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self._async_schedule_clear()
+
+    async def async_will_remove_from_hass(self) -> None:
+        if self._cancel_clear is not None:
+            self._cancel_clear()
+            self._cancel_clear = None
+        await super().async_will_remove_from_hass()
 
     @core.callback
     def _handle_coordinator_update(self) -> None:
-        device = self.coordinator.data[CONF_DEVICES][self._device_id]
-        self._last_update = parser.parse(device["newest_events"][self._sensor]["created_at"])
-        self._available = True
+        if not self.coordinator.device_changed(self._device_id):
+            return
+        device = self.coordinator.data[CONF_DEVICES].get(self._device_id)
+        self._available = device is not None
+        if device is not None and self._set_event(
+                device["newest_events"][self._sensor]["created_at"]):
+            self._async_schedule_clear()
+        self.coordinator.metrics.record_write()
         self.async_write_ha_state()
+
+
+class NatureRemoMeterSensor(NatureRemoEntity, SensorEntity):
+    """
+    Nature Remo E smart meter sensor base class.
+    Readings are decoded from the ECHONET Lite properties of the appliance and
+    the state is only written when the value or availability changed.
+    """
+
+    _key = ""
+
+    def __init__(self, device: Dict[str, Any], appliance: Appliance,
+                 coordinator: NatureRemoApiCoordinator):
+        # Readings are shown on the Remo E device, not a device of their own
+        super().__init__(coordinator, device)
+        self._appliance_id = appliance.id
+        self._attr_unique_id = f"{appliance.id}-{self._key}"
+        self._attr_name = f"{appliance.nickname or device['name']} {self._key.title()}"
+        self._written = None
+
+    @abc.abstractmethod
+    def _update(self, values: Dict[int, int]) -> None:
+        """ Decode the reading from the ECHONET Lite property values """
+
+    @core.callback
+    def _handle_coordinator_update(self) -> None:
+        if not self.coordinator.appliance_changed(self._appliance_id):
+            return
+        appliance = self.coordinator.data[CONF_ENTITIES].get(self._appliance_id)
+        self._available = appliance is not None
+        if appliance is not None:
+            self._update(meter_values(appliance.echonet))
+        written = (self.available, self._attr_native_value, self.coordinator.restored)
+        if written == self._written:
+            return
+        self._written = written
+        self.coordinator.metrics.record_write()
+        self.async_write_ha_state()
+
+
+class NatureRemoPowerSensor(NatureRemoMeterSensor):
+    """ Instantaneous power measured by a Nature Remo E smart meter """
+
+    _key = "power"
+    _attr_device_class = SensorDeviceClass.POWER
+    _attr_native_unit_of_measurement = UnitOfPower.WATT
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, device: Dict[str, Any], appliance: Appliance,
+                 coordinator: NatureRemoApiCoordinator):
+        super().__init__(device, appliance, coordinator)
+        self._update(meter_values(appliance.echonet))
+
+    def _update(self, values: Dict[int, int]) -> None:
+        self._attr_native_value = values.get(EPC_INSTANT_POWER)
+
+
+@dataclass
+class NatureRemoEnergyData(ExtraStoredData):
+    """ Rollover state of a cumulative energy sensor """
+
+    offset: float
+    last_raw: Optional[int]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"offset": self.offset, "last_raw": self.last_raw}
+
+
+class NatureRemoEnergySensor(NatureRemoMeterSensor, RestoreEntity):
+    """
+    Cumulative energy measured by a Nature Remo E smart meter.
+    The meter counter wraps around after its effective digits, the offset
+    added on rollover is restored across restarts.
+    """
+
+    _key = "energy"
+    _attr_device_class = SensorDeviceClass.ENERGY
+    _attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(self, device: Dict[str, Any], appliance: Appliance,
+                 coordinator: NatureRemoApiCoordinator):
+        super().__init__(device, appliance, coordinator)
+        self._energy = CumulativeEnergy()
+        self._attr_native_value = None
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        last = await self.async_get_last_extra_data()
+        if last is not None:
+            data = last.as_dict()
+            self._energy = CumulativeEnergy(data.get("offset") or 0.0, data.get("last_raw"))
+        appliance = self.coordinator.data[CONF_ENTITIES].get(self._appliance_id)
+        if appliance is not None:
+            self._update(meter_values(appliance.echonet))
+
+    @property
+    def extra_restore_state_data(self) -> NatureRemoEnergyData:
+        return NatureRemoEnergyData(self._energy.offset, self._energy.last_raw)
+
+    def _update(self, values: Dict[int, int]) -> None:
+        raw = values.get(EPC_CUMULATIVE_ENERGY)
+        if raw is None:
+            return
+        self._attr_native_value = self._energy.update(meter_profile_of(values), raw)
+
+
+class NatureRemoMetricSensor(SensorEntity):
+    """
+    Nature Remo API client metric.
+    Disabled by default and shown on the Remo of the oldest entry of the
+    account. The value is read from the in-memory metrics every scan interval,
+    it does not hit the cloud.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, device: Dict[str, Any], metric: str, coordinator: NatureRemoApiCoordinator):
+        name, unit, self._value = METRIC_SENSORS[metric]
+        self._coordinator = coordinator
+        self._attr_unique_id = f"{device['id']}-{metric}"
+        self._attr_name = f"{device['name']} {name}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._device_id = device['id']
+
+    @property
+    def device_info(self):
+        return {"identifiers": {(DOMAIN, self._device_id)}}
+
+    async def async_update(self):
+        """ Read the metric """
+        self._attr_native_value = self._value(self._coordinator)
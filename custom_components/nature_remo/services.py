@@ -0,0 +1,196 @@
+""" Nature Remo services """
+import asyncio
+import contextlib
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import voluptuous as vol
+from homeassistant import core
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+from . import (NatureRemoApiCoordinator, NatureRemoApiError, async_get_registry)
+from .const import (DOMAIN, BUTTON_PATHS)
+from .models import Appliance
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_SEND_SIGNALS = "send_signals"
+SERVICE_LEARN_SIGNAL = "learn_signal"
+
+ATTR_COMMANDS = "commands"
+ATTR_APPLIANCE = "appliance"
+ATTR_SIGNAL = "signal"
+ATTR_BUTTON = "button"
+ATTR_MESSAGE = "message"
+ATTR_SUCCESS = "success"
+ATTR_ERROR = "error"
+
+# Raw IR message as read from the device /messages endpoint
+MESSAGE_SCHEMA = vol.Schema({
+    vol.Required("format"): cv.string,
+    vol.Required("freq"): vol.Coerce(int),
+    vol.Required("data"): [vol.Coerce(int)],
+})
+
+
+def _button_without_message(command: Dict[str, Any]) -> Dict[str, Any]:
+    # Buttons are encoded by the cloud and have no raw message
+    if ATTR_BUTTON in command and ATTR_MESSAGE in command:
+        raise vol.Invalid("A button cannot be sent with a raw message")
+    return command
+
+
+COMMAND_SCHEMA = vol.All(
+    vol.Schema({
+        vol.Required(ATTR_APPLIANCE): cv.string,
+        vol.Exclusive(ATTR_SIGNAL, "command"): cv.string,
+        vol.Exclusive(ATTR_BUTTON, "command"): cv.string,
+        vol.Optional(ATTR_MESSAGE): MESSAGE_SCHEMA,
+    }),
+    cv.has_at_least_one_key(ATTR_SIGNAL, ATTR_BUTTON, ATTR_MESSAGE),
+    _button_without_message,
+)
+
+SEND_SIGNALS_SCHEMA = vol.Schema({
+    vol.Required(ATTR_COMMANDS): vol.All(cv.ensure_list, [COMMAND_SCHEMA]),
+})
+
+LEARN_SIGNAL_SCHEMA = vol.Schema({
+    vol.Required(ATTR_APPLIANCE): cv.string,
+    vol.Required(ATTR_SIGNAL): cv.string,
+})
+
+Send = Callable[[], Awaitable[Any]]
+
+
+@core.callback
+def async_setup_services(hass: core.HomeAssistant) -> None:
+    """ Register the Nature Remo services """
+
+    async def _async_send_signals(call: core.ServiceCall) -> core.ServiceResponse:
+        return {"results": await async_send_batch(hass, call.data[ATTR_COMMANDS])}
+
+    async def _async_learn_signal(call: core.ServiceCall) -> core.ServiceResponse:
+        found = async_get_registry(hass).find_appliance(call.data[ATTR_APPLIANCE])
+        if found is None:
+            raise HomeAssistantError(f"Unknown appliance {call.data[ATTR_APPLIANCE]}")
+        coordinator, appliance = found
+        try:
+            signal_id = _signal_id(appliance, call.data[ATTR_SIGNAL])
+            message = await coordinator.async_learn_message(appliance.device_id, signal_id)
+        except (ValueError, NatureRemoApiError) as error:
+            raise HomeAssistantError(str(error)) from error
+        return {ATTR_MESSAGE: message}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SEND_SIGNALS,
+        _async_send_signals,
+        schema=SEND_SIGNALS_SCHEMA,
+        supports_response=core.SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_LEARN_SIGNAL,
+        _async_learn_signal,
+        schema=LEARN_SIGNAL_SCHEMA,
+        supports_response=core.SupportsResponse.OPTIONAL,
+    )
+
+
+def _signal_id(appliance: Appliance, name: str) -> str:
+    """ Return the id of a signal of the appliance by id or name, ValueError if unknown """
+    for signal in appliance.signals:
+        if name in (signal.id, signal.name):
+            return signal.id
+    raise ValueError(f"Unknown signal {name}")
+
+
+def _command(coordinator: NatureRemoApiCoordinator, appliance: Appliance,
+             command: Dict[str, str]) -> Tuple[Send, bool]:
+    """
+    Return the coroutine function sending a command and whether it goes
+    through the cloud, ValueError if invalid.
+    A raw message, given or learned, is blasted by the Remo over the LAN, with
+    the signal (if any) sent through the cloud when the device does not answer.
+    """
+    if ATTR_SIGNAL in command or ATTR_MESSAGE in command:
+        signal_id = _signal_id(appliance, command[ATTR_SIGNAL]) if ATTR_SIGNAL in command else None
+        message = command.get(ATTR_MESSAGE)
+        cloud = not coordinator.api.sends_locally(appliance.device_id, signal_id, message)
+        return lambda: coordinator.async_send_ir(appliance.device_id, signal_id, message), cloud
+
+    name = command[ATTR_BUTTON]
+    if appliance.type not in BUTTON_PATHS:
+        raise ValueError(f"{appliance.type} appliances have no buttons")
+    if name not in {button.name for button in appliance.buttons}:
+        raise ValueError(f"Unknown button {name}")
+    path = f"/appliances/{appliance.id}/{BUTTON_PATHS[appliance.type]}"
+    return lambda: coordinator.async_post(path, {"button": name}), True
+
+
+def _result(command: Dict[str, str], error: Optional[str] = None) -> Dict[str, Any]:
+    result: Dict[str, Any] = dict(command)
+    result[ATTR_SUCCESS] = error is None
+    if error is not None:
+        result[ATTR_ERROR] = error
+    return result
+
+
+async def async_send_batch(hass: core.HomeAssistant,
+                           commands: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+    """
+    Send a batch of IR commands and return one result per command.
+    Commands for the same Remo device are sent one after the other, in order,
+    since a device blasts one signal at a time; devices are sent to in
+    parallel. The commands sent through the cloud must fit in the remaining
+    rate limit budget of each account, and polls wait until it has been sent.
+    """
+    registry = async_get_registry(hass)
+    results: List[Optional[Dict[str, Any]]] = [None] * len(commands)
+    queues: Dict[Tuple[str, str], List[Tuple[int, Send]]] = {}
+    coordinators: Dict[str, NatureRemoApiCoordinator] = {}
+    counts: Dict[str, int] = {}
+
+    for index, command in enumerate(commands):
+        found = registry.find_appliance(command[ATTR_APPLIANCE])
+        if found is None:
+            results[index] = _result(command, f"Unknown appliance {command[ATTR_APPLIANCE]}")
+            continue
+        coordinator, appliance = found
+        try:
+            send, cloud = _command(coordinator, appliance, command)
+        except ValueError as error:
+            results[index] = _result(command, str(error))
+            continue
+        coordinators[coordinator.account] = coordinator
+        if cloud:
+            counts[coordinator.account] = counts.get(coordinator.account, 0) + 1
+        queues.setdefault((coordinator.account, appliance.device_id), []).append((index, send))
+
+    for account, count in counts.items():
+        limiter = coordinators[account].api.rate_limiter
+        if not limiter.fits(count):
+            raise HomeAssistantError(
+                f"Batch of {count} cloud commands exceeds the remaining rate limit "
+                f"budget ({limiter.remaining})"
+            )
+
+    async def _async_send_device(queue: List[Tuple[int, Send]]) -> None:
+        # The coordinator serializes each command with the other IR commands
+        # of the device, the queue keeps the batch in order.
+        for index, send in queue:
+            try:
+                await send()
+            except NatureRemoApiError as error:
+                _LOGGER.warning("Failed to send %s: %s", commands[index], error)
+                results[index] = _result(commands[index], str(error))
+            else:
+                results[index] = _result(commands[index])
+
+    with contextlib.ExitStack() as stack:
+        for coordinator in coordinators.values():
+            stack.enter_context(coordinator.api.rate_limiter.hold_polls())
+        await asyncio.gather(*(_async_send_device(queue) for queue in queues.values()))
+
+    return results
@@ -0,0 +1,273 @@
+"""Local stand-in for the Nature Remo cloud API (api.nature.global)."""
+import asyncio
+import hashlib
+import json
+import time
+
+from unittest.mock import patch
+
+from aiohttp import web
+from homeassistant.const import CONF_ACCESS_TOKEN, CONF_DEVICE_ID
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.nature_remo.const import DOMAIN
+
+CREATED_AT = "2023-01-01T00:00:00Z"
+
+
+def make_device(index):
+    """Return a Remo device as returned by /devices."""
+    return {
+        "id": f"device-{index}",
+        "name": f"Remo {index}",
+        "serial_number": f"1W{index:08d}",
+        "mac_address": f"00:00:00:00:{index // 256:02x}:{index % 256:02x}",
+        "firmware_version": "Remo/1.0.0",
+        "newest_events": {
+            "te": {"val": 22.5, "created_at": CREATED_AT},
+            "hu": {"val": 40, "created_at": CREATED_AT},
+            "il": {"val": 120, "created_at": CREATED_AT},
+            "mo": {"val": 1, "created_at": CREATED_AT},
+        },
+    }
+
+
+def make_aircon(device, index):
+    """Return an AC appliance as returned by /appliances."""
+    temps = [str(temp) for temp in range(16, 31)]
+    mode = {"temp": temps, "vol": ["auto", "1", "2", "3"], "dir": ["auto", "swing"]}
+    return {
+        "id": f"aircon-{index}",
+        "type": "AC",
+        "nickname": f"Aircon {index}",
+        "image": "ico_ac_1",
+        "device": {"id": device["id"], "name": device["name"]},
+        "model": {"id": "model", "manufacturer": "Daikin", "name": "Daikin AC", "image": "ico_ac_1"},
+        "settings": {"temp": "25", "mode": "cool", "vol": "auto", "dir": "auto", "button": ""},
+        "aircon": {
+            "range": {
+                "modes": {"cool": mode, "warm": mode, "dry": mode, "blow": mode, "auto": mode},
+                "fixedButtons": ["power-off"],
+            },
+            "tempUnit": "c",
+        },
+        "signals": [
+            {"id": f"signal-{index}-{signal}", "name": f"Signal {signal}", "image": "ico_on"}
+            for signal in range(10)
+        ],
+    }
+
+
+def make_light(device, index):
+    """Return a LIGHT appliance as returned by /appliances."""
+    return {
+        "id": f"light-{index}",
+        "type": "LIGHT",
+        "nickname": f"Light {index}",
+        "image": "ico_light",
+        "device": {"id": device["id"], "name": device["name"]},
+        "model": {"id": "model", "manufacturer": "Panasonic", "name": "Panasonic Light"},
+        "light": {
+            "buttons": [
+                {"name": name, "image": f"ico_{name}", "label": name.title()}
+                for name in ("on", "off", "night", "bright-up", "bright-down")
+            ],
+            "state": {"brightness": "100", "power": "on", "last_button": "on"},
+        },
+        "signals": [],
+    }
+
+
+def make_tv(device, index):
+    """Return a TV appliance as returned by /appliances."""
+    return {
+        "id": f"tv-{index}",
+        "type": "TV",
+        "nickname": f"TV {index}",
+        "image": "ico_tv",
+        "device": {"id": device["id"], "name": device["name"]},
+        "model": {"id": "model", "manufacturer": "Sharp", "name": "Sharp TV"},
+        "tv": {
+            "buttons": [
+                {"name": name, "image": f"ico_{name}", "label": name.title()}
+                for name in ("power", "vol-up", "vol-down", "mute", "ch-up", "ch-down")
+            ],
+            "state": {"input": "t"},
+        },
+        "signals": [{"id": f"tv-signal-{index}", "name": "Netflix", "image": "ico_io"}],
+    }
+
+
+def make_smart_meter(device, index):
+    """Return an EL_SMART_METER appliance as returned by /appliances."""
+    return {
+        "id": f"meter-{index}",
+        "type": "EL_SMART_METER",
+        "nickname": f"Smart Meter {index}",
+        "image": "ico_smartmeter",
+        "device": {"id": device["id"], "name": device["name"]},
+        "model": {"id": "model", "manufacturer": "", "name": "Smart Meter"},
+        "smart_meter": {
+            "echonetlite_properties": [
+                {"name": "coefficient", "epc": 211, "val": "1", "updated_at": CREATED_AT},
+                {"name": "cumulative_electric_energy_effective_digits", "epc": 215,
+                 "val": "6", "updated_at": CREATED_AT},
+                {"name": "normal_direction_cumulative_electric_energy", "epc": 224,
+                 "val": "123456", "updated_at": CREATED_AT},
+                {"name": "cumulative_electric_energy_unit", "epc": 225,
+                 "val": "1", "updated_at": CREATED_AT},
+                {"name": "measured_instantaneous", "epc": 231,
+                 "val": "550", "updated_at": CREATED_AT},
+            ],
+        },
+        "signals": [],
+    }
+
+
+class FakeNatureCloud:
+    """
+    Scriptable fake of the Nature cloud.
+
+    delay adds latency to every response, rate_limited makes the next N
+    requests answer 429, failing makes them answer 500 and bad_gateway makes
+    them answer a 502 HTML page. requests counts calls per path.
+
+    With etags responses carry an ETag and requests with a matching
+    If-None-Match get a 304, counted in not_modified. Signals sent and light
+    or TV buttons pressed are recorded in signals_sent and buttons_pressed,
+    max_posts_in_flight is the most POSTs handled at the same time.
+    """
+
+    def __init__(self, devices=1, delay=0.0, limit=30):
+        self.delay = delay
+        self.rate_limited = 0
+        self.failing = 0
+        self.bad_gateway = 0
+        self.etags = False
+        self.not_modified = 0
+        self.limit = limit
+        self.remaining = limit
+        self.reset = int(time.time()) + 300
+        self.requests = {}
+        self.devices = [make_device(index) for index in range(devices)]
+        self.appliances = [
+            make_aircon(device, index) for index, device in enumerate(self.devices)
+        ]
+        self.app = web.Application()
+        self.app.router.add_get("/1/users/me", self._get_me)
+        self.app.router.add_get("/1/devices", self._get_devices)
+        self.app.router.add_get("/1/appliances", self._get_appliances)
+        self.app.router.add_post("/1/appliances/{appliance}/aircon_settings", self._post_aircon)
+        self.app.router.add_post("/1/appliances/{appliance}/light", self._post_light)
+        self.app.router.add_post("/1/appliances/{appliance}/tv", self._post_tv)
+        self.app.router.add_post("/1/signals/{signal}/send", self._post_signal)
+        self.signals_sent = []
+        self.buttons_pressed = []
+        self.posts_in_flight = 0
+        self.max_posts_in_flight = 0
+
+    def touch(self, count=1):
+        """Change the temperature reading of the first count devices."""
+        for device in self.devices[:count]:
+            event = device["newest_events"]["te"]
+            event["val"] = round(event["val"] + 0.1, 1)
+
+    @property
+    def total_requests(self):
+        """Return the number of requests received."""
+        return sum(self.requests.values())
+
+    async def _respond(self, request, payload):
+        self.requests[request.path] = self.requests.get(request.path, 0) + 1
+        if self.delay:
+            post = request.method == "POST"
+            self.posts_in_flight += post
+            self.max_posts_in_flight = max(self.max_posts_in_flight, self.posts_in_flight)
+            await asyncio.sleep(self.delay)
+            self.posts_in_flight -= post
+        self.remaining -= 1
+        headers = {
+            "X-Rate-Limit-Limit": str(self.limit),
+            "X-Rate-Limit-Remaining": str(max(self.remaining, 0)),
+            "X-Rate-Limit-Reset": str(self.reset),
+        }
+        if self.bad_gateway > 0:
+            self.bad_gateway -= 1
+            return web.Response(text="<html>502 Bad Gateway</html>", status=502,
+                                content_type="text/html", headers=headers)
+        if self.failing > 0:
+            self.failing -= 1
+            return web.json_response({"code": 500001, "message": "Internal Server Error"},
+                                     status=500, headers=headers)
+        if self.rate_limited > 0 or self.remaining < 0:
+            self.rate_limited -= 1
+            return web.json_response({"code": 429001, "message": "Too Many Requests"},
+                                     status=429, headers=headers)
+        if self.etags:
+            body = json.dumps(payload, sort_keys=True).encode()
+            headers["ETag"] = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+            if request.headers.get("If-None-Match") == headers["ETag"]:
+                self.not_modified += 1
+                return web.Response(status=304, headers=headers)
+        return web.json_response(payload, headers=headers)
+
+    async def _get_me(self, request):
+        return await self._respond(request, {"id": "user", "nickname": "user"})
+
+    async def _get_devices(self, request):
+        return await self._respond(request, self.devices)
+
+    async def _get_appliances(self, request):
+        return await self._respond(request, self.appliances)
+
+    async def _post_aircon(self, request):
+        data = await request.post()
+        for appliance in self.appliances:
+            if appliance["id"] == request.match_info["appliance"]:
+                settings = appliance["settings"]
+                settings["temp"] = data.get("temperature", settings["temp"])
+                settings["mode"] = data.get("operation_mode", settings["mode"])
+                settings["vol"] = data.get("air_volume", settings["vol"])
+                settings["dir"] = data.get("air_direction", settings["dir"])
+                settings["button"] = data.get("button", "")
+                return await self._respond(request, settings)
+        raise web.HTTPNotFound()
+
+    async def _press(self, request, kind):
+        data = await request.post()
+        for appliance in self.appliances:
+            if appliance["id"] == request.match_info["appliance"] and kind in appliance:
+                self.buttons_pressed.append((appliance["id"], data["button"]))
+                return appliance[kind]["state"], data["button"]
+        raise web.HTTPNotFound()
+
+    async def _post_light(self, request):
+        state, button = await self._press(request, "light")
+        if button in ("on", "off"):
+            state["power"] = button
+        state["last_button"] = button
+        return await self._respond(request, state)
+
+    async def _post_tv(self, request):
+        state, _ = await self._press(request, "tv")
+        return await self._respond(request, state)
+
+    async def _post_signal(self, request):
+        self.signals_sent.append(request.match_info["signal"])
+        return await self._respond(request, {})
+
+
+async def async_setup_account(hass, server, devices):
+    """Set up one config entry per device of the fake account."""
+    entries = []
+    with patch("custom_components.nature_remo.BASE_URL", str(server.make_url("/1"))):
+        for index in range(devices):
+            entry = MockConfigEntry(
+                domain=DOMAIN, version=2, unique_id=f"device-{index}",
+                data={CONF_ACCESS_TOKEN: "token", CONF_DEVICE_ID: f"device-{index}"},
+            )
+            entry.add_to_hass(hass)
+            assert await hass.config_entries.async_setup(entry.entry_id)
+            entries.append(entry)
+        await hass.async_block_till_done()
+    return entries
@@ -0,0 +1,27 @@
+"""Local stand-in for the Nature Remo device LAN API."""
+from aiohttp import web
+
+
+class FakeRemo:
+    """Serve /messages like a Remo device does on the LAN."""
+
+    def __init__(self):
+        self.messages = []
+        self.last_received = {"format": "us", "freq": 38, "data": [100, 200, 100]}
+        self.app = web.Application()
+        self.app.router.add_get("/messages", self._get_messages)
+        self.app.router.add_post("/messages", self._post_messages)
+
+    @staticmethod
+    def _check_local(request):
+        if request.headers.get("X-Requested-With") != "local":
+            raise web.HTTPBadRequest()
+
+    async def _get_messages(self, request):
+        self._check_local(request)
+        return web.json_response(self.last_received)
+
+    async def _post_messages(self, request):
+        self._check_local(request)
+        self.messages.append(await request.json())
+        return web.Response(status=200)
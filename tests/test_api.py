@@ -0,0 +1,161 @@
+"""Test the Nature Remo cloud API client."""
+import asyncio
+from unittest.mock import call, patch
+
+import aiohttp
+from homeassistant.const import EVENT_STATE_CHANGED
+import pytest
+
+from custom_components.nature_remo import (
+    NatureRemoApi,
+    NatureRemoApiConnectionError,
+    NatureRemoApiServerError,
+    NatureRemoCircuitOpenError,
+    async_get_coordinator,
+)
+from custom_components.nature_remo.circuit import NatureRemoCircuitBreaker
+from custom_components.nature_remo.const import RETRY_BACKOFF
+
+from .fake_cloud import FakeNatureCloud, async_setup_account
+
+
+async def _async_api(aiohttp_server, cloud, session):
+    server = await aiohttp_server(cloud.app)
+    return NatureRemoApi(str(server.make_url("/1")), "token", session)
+
+
+async def _async_setup(hass, aiohttp_server, cloud):
+    server = await aiohttp_server(cloud.app)
+    entry, = await async_setup_account(hass, server, 1)
+    coordinator = async_get_coordinator(hass, entry)
+    writes = []
+    hass.bus.async_listen(EVENT_STATE_CHANGED, writes.append)
+    return coordinator, writes
+
+
+async def test_not_modified_skips_decoding(hass, aiohttp_server):
+    """Test a 304 answer reuses the cached payload without waking entities."""
+    cloud = FakeNatureCloud()
+    cloud.etags = True
+    coordinator, writes = await _async_setup(hass, aiohttp_server, cloud)
+    data = coordinator.data
+    decoded = coordinator.metrics.decode.count
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert cloud.not_modified == 1
+    assert coordinator.metrics.decode.count == decoded
+    assert coordinator.data is data
+    assert writes == []
+
+    cloud.touch()
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert coordinator.metrics.decode.count == decoded + 1
+    assert coordinator.data is not data
+
+
+async def test_unchanged_body_skips_decoding(hass, aiohttp_server):
+    """Test an identical body without validators is not decoded again."""
+    cloud = FakeNatureCloud()
+    coordinator, writes = await _async_setup(hass, aiohttp_server, cloud)
+    data = coordinator.data
+    decoded = coordinator.metrics.decode.count
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert cloud.requests["/1/devices"] == 2
+    assert coordinator.metrics.decode.count == decoded
+    assert coordinator.data is data
+    assert writes == []
+
+
+async def test_get_retried_with_backoff(aiohttp_server):
+    """Test failed GETs are retried with an exponential backoff."""
+    cloud = FakeNatureCloud()
+    cloud.failing = 2
+    async with aiohttp.ClientSession() as session:
+        api = await _async_api(aiohttp_server, cloud, session)
+        with patch("custom_components.nature_remo.random.uniform", return_value=0) as uniform:
+            assert await api.get_devices() == cloud.devices
+
+    assert cloud.requests["/1/devices"] == 3
+    assert uniform.call_args_list == [call(0, RETRY_BACKOFF), call(0, RETRY_BACKOFF * 2)]
+
+
+async def test_post_not_retried(aiohttp_server):
+    """Test commands are sent once even when the cloud fails."""
+    cloud = FakeNatureCloud()
+    cloud.failing = 1
+    async with aiohttp.ClientSession() as session:
+        api = await _async_api(aiohttp_server, cloud, session)
+        with pytest.raises(NatureRemoApiServerError):
+            await api.send_ir("device-0", "signal-0-0")
+
+    assert cloud.signals_sent == ["signal-0-0"]
+
+
+async def test_timeout(aiohttp_server):
+    """Test a slow cloud times out and counts as a transport failure."""
+    cloud = FakeNatureCloud(delay=0.5)
+    async with aiohttp.ClientSession() as session:
+        api = await _async_api(aiohttp_server, cloud, session)
+        with patch(
+            "custom_components.nature_remo.REQUEST_TIMEOUT", aiohttp.ClientTimeout(total=0.05)
+        ), patch("custom_components.nature_remo.random.uniform", return_value=0):
+            with pytest.raises(NatureRemoApiConnectionError):
+                await api.get_devices()
+
+    assert cloud.requests["/1/devices"] == 3
+    assert api.circuit_breaker.failures == 3
+
+
+async def test_non_json_server_error(aiohttp_server):
+    """Test an HTML 5xx page raises a server error instead of a decode error."""
+    cloud = FakeNatureCloud()
+    cloud.bad_gateway = 3
+    async with aiohttp.ClientSession() as session:
+        api = await _async_api(aiohttp_server, cloud, session)
+        with patch("custom_components.nature_remo.random.uniform", return_value=0):
+            with pytest.raises(NatureRemoApiServerError):
+                await api.get_devices()
+
+    assert api.circuit_breaker.failures == 3
+
+
+async def test_open_circuit_uses_no_budget(aiohttp_server):
+    """Test requests refused by the open circuit keep their rate limit token."""
+    cloud = FakeNatureCloud()
+    async with aiohttp.ClientSession() as session:
+        api = await _async_api(aiohttp_server, cloud, session)
+        api.circuit_breaker = NatureRemoCircuitBreaker(threshold=1)
+        api.circuit_breaker.record_failure()
+        remaining = api.rate_limiter.remaining
+
+        for _ in range(10):
+            with pytest.raises(NatureRemoCircuitOpenError):
+                await api.get_devices()
+
+    assert api.rate_limiter.remaining == remaining
+    assert "/1/devices" not in cloud.requests
+
+
+async def test_cancelled_probe_released(aiohttp_server):
+    """Test a cancelled probe lets the next request probe the cloud."""
+    cloud = FakeNatureCloud(delay=0.5)
+    async with aiohttp.ClientSession() as session:
+        api = await _async_api(aiohttp_server, cloud, session)
+        api.circuit_breaker = NatureRemoCircuitBreaker(threshold=1, reset_timeout=0)
+        api.circuit_breaker.record_failure()
+
+        probe = asyncio.ensure_future(api.get_devices())
+        await asyncio.sleep(0.1)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+        cloud.delay = 0
+        assert await api.get_devices() == cloud.devices
+    assert not api.circuit_breaker.is_open
@@ -0,0 +1,91 @@
+"""Benchmarks driving the coordinator and platforms through the fake cloud."""
+import statistics
+import time
+import tracemalloc
+
+from homeassistant.const import EVENT_STATE_CHANGED
+import pytest
+
+from custom_components.nature_remo import _changed_ids, async_get_coordinator
+
+from .fake_cloud import FakeNatureCloud, async_setup_account, make_device
+
+POLLS = 50
+LIMIT = 100000
+
+
+@pytest.mark.parametrize("devices", [1, 10, 100])
+async def test_refresh_metrics(hass, aiohttp_server, benchmark, devices):
+    """Report cloud calls, refresh latency, state writes and memory per entity."""
+    cloud = FakeNatureCloud(devices=devices, limit=LIMIT)
+    server = await aiohttp_server(cloud.app)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    entries = await async_setup_account(hass, server, devices)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    entities = len(hass.states.async_all())
+    memory = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    coordinator = async_get_coordinator(hass, entries[0])
+
+    writes = []
+    hass.bus.async_listen(EVENT_STATE_CHANGED, writes.append)
+
+    requests_before = cloud.total_requests
+    latencies = []
+    for _ in range(POLLS):
+        cloud.touch()
+        start = time.perf_counter()
+        await coordinator.async_refresh()
+        latencies.append(time.perf_counter() - start)
+    await hass.async_block_till_done()
+
+    interval = coordinator.update_interval.total_seconds()
+    calls_per_poll = (cloud.total_requests - requests_before) / POLLS
+    percentiles = statistics.quantiles(latencies, n=100)
+    benchmark.extra_info.update({
+        "devices": devices,
+        "entities": entities,
+        "cloud_calls_per_hour": calls_per_poll * 3600 / interval,
+        "refresh_p50_ms": percentiles[49] * 1000,
+        "refresh_p99_ms": percentiles[98] * 1000,
+        "state_writes_per_poll": len(writes) / POLLS,
+        "memory_per_entity_bytes": memory / max(entities, 1),
+    })
+
+    # Only entities of the device whose reading changed (four sensors and the
+    # aircon) may write state
+    assert len(writes) / POLLS <= 5
+    # Appliances are not polled on every refresh
+    assert calls_per_poll == 1
+
+    # Time the CPU side of a refresh: indexing and diffing the snapshot
+    previous = {device["id"]: device for device in cloud.devices}
+    current = {device["id"]: dict(device) for device in cloud.devices}
+    benchmark(_changed_ids, previous, current)
+
+
+async def test_rate_limited_polls_keep_snapshot(hass, aiohttp_server):
+    """Test 429 responses keep the previous snapshot instead of failing."""
+    cloud = FakeNatureCloud(devices=1, limit=LIMIT)
+    server = await aiohttp_server(cloud.app)
+    entries = await async_setup_account(hass, server, 1)
+    coordinator = async_get_coordinator(hass, entries[0])
+    data = coordinator.data
+
+    cloud.rate_limited = 1
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.data is data
+
+
+def test_diff_large_account(benchmark):
+    """Benchmark diffing a 100 device snapshot with one changed device."""
+    previous = {f"device-{index}": make_device(index) for index in range(100)}
+    current = {key: dict(value) for key, value in previous.items()}
+    current["device-0"] = make_device(1000)
+
+    assert benchmark(_changed_ids, previous, current) == {"device-0"}
@@ -0,0 +1,59 @@
+"""Test the Nature Remo buttons."""
+from homeassistant.components.button import DOMAIN as BUTTON_DOMAIN, SERVICE_PRESS
+from homeassistant.const import ATTR_ENTITY_ID, CONF_HOST
+
+from custom_components.nature_remo import async_get_coordinator
+from custom_components.nature_remo.const import DOMAIN
+from custom_components.nature_remo.services import SERVICE_LEARN_SIGNAL
+
+from .fake_cloud import FakeNatureCloud, async_setup_account, make_tv
+from .fake_remo import FakeRemo
+
+
+async def test_buttons_send_signals_and_presets(hass, aiohttp_server):
+    """Test learned signals and preset buttons are sent to the cloud."""
+    cloud = FakeNatureCloud()
+    cloud.appliances.append(make_tv(cloud.devices[0], 0))
+    server = await aiohttp_server(cloud.app)
+    await async_setup_account(hass, server, 1)
+
+    for entity_id in ("button.aircon_0_signal_3", "button.tv_0_netflix", "button.tv_0_mute"):
+        await hass.services.async_call(
+            BUTTON_DOMAIN, SERVICE_PRESS, {ATTR_ENTITY_ID: entity_id}, blocking=True
+        )
+
+    assert cloud.signals_sent == ["signal-0-3", "tv-signal-0"]
+    assert cloud.buttons_pressed == [("tv-0", "mute")]
+
+
+async def test_learned_signal_sent_over_lan(hass, aiohttp_server):
+    """Test a button blasts the message learned for its signal over the LAN."""
+    cloud = FakeNatureCloud()
+    remo = FakeRemo()
+    server = await aiohttp_server(cloud.app)
+    remo_server = await aiohttp_server(remo.app)
+    entry, = await async_setup_account(hass, server, 1)
+    hass.config_entries.async_update_entry(
+        entry, options={CONF_HOST: f"{remo_server.host}:{remo_server.port}"}
+    )
+    await hass.async_block_till_done()
+
+    response = await hass.services.async_call(
+        DOMAIN, SERVICE_LEARN_SIGNAL, {"appliance": "aircon-0", "signal": "Signal 3"},
+        blocking=True, return_response=True,
+    )
+    assert response == {"message": remo.last_received}
+
+    await hass.services.async_call(
+        BUTTON_DOMAIN, SERVICE_PRESS, {ATTR_ENTITY_ID: "button.aircon_0_signal_3"},
+        blocking=True,
+    )
+    assert remo.messages == [remo.last_received]
+    assert cloud.signals_sent == []
+
+    # LAN requests do not go through the cloud session
+    api = async_get_coordinator(hass, entry).api
+    assert api.local_session is not api.session
+    assert api.connections.new_connections + api.connections.reused_connections == (
+        cloud.total_requests
+    )
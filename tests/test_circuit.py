@@ -0,0 +1,47 @@
+"""Test the cloud circuit breaker."""
+from custom_components.nature_remo.circuit import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    NatureRemoCircuitBreaker,
+)
+
+
+def test_opens_after_failures_and_probes():
+    """Test the circuit opens, lets one probe through and closes on success."""
+    breaker = NatureRemoCircuitBreaker(threshold=2, reset_timeout=0)
+
+    breaker.record_failure()
+    assert breaker.state == STATE_CLOSED
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+
+    assert breaker.allow_request() is True
+    assert breaker.state == STATE_HALF_OPEN
+    assert breaker.allow_request() is False
+
+    breaker.record_success()
+    assert breaker.state == STATE_CLOSED
+    assert breaker.allow_request() is True
+
+
+def test_failed_probe_reopens():
+    """Test a failed probe opens the circuit again."""
+    breaker = NatureRemoCircuitBreaker(threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.allow_request() is True
+
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+
+
+def test_released_probe_allows_another():
+    """Test a probe ended without an outcome frees the probe slot."""
+    breaker = NatureRemoCircuitBreaker(threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.allow_request() is True
+    assert breaker.allow_request() is False
+
+    breaker.release_probe()
+    assert breaker.state == STATE_HALF_OPEN
+    assert breaker.allow_request() is True
@@ -0,0 +1,43 @@
+"""Test the cloud client connection statistics."""
+from types import SimpleNamespace
+
+from yarl import URL
+
+from custom_components.nature_remo.client import NatureRemoConnectionStats
+
+
+async def _async_send(signal, context, params=None):
+    for handler in signal:
+        await handler(None, context, params)
+
+
+async def _async_request(trace, url, reused=False, dns_cached=True):
+    """Run the hooks aiohttp calls for one request."""
+    context = SimpleNamespace()
+    await _async_send(trace.on_request_start, context, SimpleNamespace(url=URL(url)))
+    if reused:
+        await _async_send(trace.on_connection_reuseconn, context)
+        return
+    await _async_send(trace.on_dns_cache_hit if dns_cached else trace.on_dns_cache_miss, context)
+    await _async_send(trace.on_connection_create_end, context)
+
+
+async def test_trace_hooks_update_stats():
+    """Test new https connections count a TLS handshake and reuse is tracked."""
+    stats = NatureRemoConnectionStats()
+    trace = stats.trace_config()
+    assert stats.reuse_rate is None
+
+    await _async_request(trace, "https://api.nature.global/1/devices", dns_cached=False)
+    await _async_request(trace, "https://api.nature.global/1/devices", reused=True)
+    await _async_request(trace, "https://api.nature.global/1/devices", reused=True)
+    await _async_request(trace, "http://192.168.1.2/messages")
+
+    assert stats.as_dict() == {
+        "new_connections": 2,
+        "reused_connections": 2,
+        "reuse_rate": 0.5,
+        "tls_handshakes": 1,
+        "dns_cache_hits": 1,
+        "dns_cache_misses": 1,
+    }
@@ -0,0 +1,124 @@
+"""Test the Nature Remo aircon."""
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.components.climate import (
+    ATTR_FAN_MODE, ATTR_HVAC_MODE, ATTR_SWING_MODE, DOMAIN as CLIMATE_DOMAIN,
+    SERVICE_SET_FAN_MODE, SERVICE_SET_HVAC_MODE, SERVICE_SET_SWING_MODE,
+    SERVICE_SET_TEMPERATURE, HVACMode,
+)
+from homeassistant.const import ATTR_ENTITY_ID, ATTR_TEMPERATURE, STATE_UNAVAILABLE
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.nature_remo import NatureRemoApiServerError, async_get_coordinator
+from custom_components.nature_remo.const import ATTR_PENDING_COMMANDS, CONF_OPTIMISTIC
+
+from .fake_cloud import FakeNatureCloud, async_setup_account
+
+AIRCON = "climate.remo_0_daikin_ac"
+SETTINGS_PATH = "/1/appliances/aircon-0/aircon_settings"
+
+
+async def _async_setup_optimistic(hass, aiohttp_server, cloud):
+    server = await aiohttp_server(cloud.app)
+    entry, = await async_setup_account(hass, server, 1)
+    hass.config_entries.async_update_entry(entry, options={CONF_OPTIMISTIC: True})
+    await hass.async_block_till_done()
+
+
+async def _async_set_hvac_mode(hass, mode):
+    await hass.services.async_call(
+        CLIMATE_DOMAIN, SERVICE_SET_HVAC_MODE,
+        {ATTR_ENTITY_ID: AIRCON, ATTR_HVAC_MODE: mode}, blocking=True,
+    )
+
+
+async def test_optimistic_mode_applied_before_response(hass, aiohttp_server):
+    """Test the requested mode shows before the cloud answers."""
+    cloud = FakeNatureCloud(delay=0.1)
+    await _async_setup_optimistic(hass, aiohttp_server, cloud)
+
+    await _async_set_hvac_mode(hass, HVACMode.HEAT)
+    state = hass.states.get(AIRCON)
+    assert state.state == HVACMode.HEAT
+    assert state.attributes[ATTR_PENDING_COMMANDS] == {
+        "operation_mode": "warm", "temperature": 20,
+    }
+
+    await hass.async_block_till_done()
+    state = hass.states.get(AIRCON)
+    assert state.state == HVACMode.HEAT
+    assert ATTR_PENDING_COMMANDS not in state.attributes
+    assert cloud.appliances[0]["settings"]["mode"] == "warm"
+
+
+async def test_optimistic_mode_rolled_back_on_failure(hass, aiohttp_server):
+    """Test a failed command restores the confirmed mode and notifies."""
+    cloud = FakeNatureCloud()
+    await _async_setup_optimistic(hass, aiohttp_server, cloud)
+    cloud.failing = 1
+
+    with patch(
+        "homeassistant.components.persistent_notification.async_create"
+    ) as notify:
+        await _async_set_hvac_mode(hass, HVACMode.HEAT)
+        assert hass.states.get(AIRCON).state == HVACMode.HEAT
+        await hass.async_block_till_done()
+
+    state = hass.states.get(AIRCON)
+    assert state.state == HVACMode.COOL
+    assert ATTR_PENDING_COMMANDS not in state.attributes
+    assert notify.call_args.kwargs["notification_id"] == "nature_remo_aircon-0"
+
+
+async def test_failure_raised_without_optimistic_mode(hass, aiohttp_server):
+    """Test a failed command is raised to the caller and keeps the mode."""
+    cloud = FakeNatureCloud()
+    server = await aiohttp_server(cloud.app)
+    await async_setup_account(hass, server, 1)
+    cloud.failing = 1
+
+    with pytest.raises(NatureRemoApiServerError):
+        await _async_set_hvac_mode(hass, HVACMode.HEAT)
+
+    assert hass.states.get(AIRCON).state == HVACMode.COOL
+
+
+async def test_sequential_changes_merged(hass, aiohttp_server):
+    """Test optimistic changes made one after the other are sent as one command."""
+    cloud = FakeNatureCloud()
+    await _async_setup_optimistic(hass, aiohttp_server, cloud)
+
+    for service, data in (
+        (SERVICE_SET_TEMPERATURE, {ATTR_TEMPERATURE: 27}),
+        (SERVICE_SET_FAN_MODE, {ATTR_FAN_MODE: "2"}),
+        (SERVICE_SET_SWING_MODE, {ATTR_SWING_MODE: "swing"}),
+    ):
+        await hass.services.async_call(
+            CLIMATE_DOMAIN, service, {ATTR_ENTITY_ID: AIRCON, **data}, blocking=True,
+        )
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+    await hass.async_block_till_done()
+
+    assert cloud.requests[SETTINGS_PATH] == 1
+    state = hass.states.get(AIRCON)
+    assert state.attributes[ATTR_TEMPERATURE] == 27
+    assert state.attributes[ATTR_FAN_MODE] == "2"
+    assert state.attributes[ATTR_SWING_MODE] == "swing"
+
+
+async def test_removed_device_unavailable(hass, aiohttp_server):
+    """Test an aircon whose Remo left the account becomes unavailable."""
+    cloud = FakeNatureCloud()
+    server = await aiohttp_server(cloud.app)
+    entry, = await async_setup_account(hass, server, 1)
+    coordinator = async_get_coordinator(hass, entry)
+
+    cloud.devices.clear()
+    await coordinator.async_refresh()
+
+    assert hass.states.get(AIRCON).state == STATE_UNAVAILABLE
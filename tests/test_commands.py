@@ -0,0 +1,42 @@
+"""Test the appliance command buffer."""
+import asyncio
+
+from custom_components.nature_remo.commands import NatureRemoCommandBuffer
+
+
+async def test_settings_merged_into_one_post(hass):
+    """Test changes submitted together are sent as one command."""
+    posts = []
+    responses = []
+
+    async def post(data):
+        posts.append(dict(data))
+        return {"posted": len(posts)}
+
+    buffer = NatureRemoCommandBuffer(hass, post, responses.append, 0)
+    results = await asyncio.gather(
+        buffer.async_submit({"temperature": "25"}),
+        buffer.async_submit({"air_volume": "auto"}),
+        buffer.async_submit({"air_direction": "swing"}),
+    )
+
+    assert posts == [{"temperature": "25", "air_volume": "auto", "air_direction": "swing"}]
+    assert responses == [{"posted": 1}]
+    assert results == [{"posted": 1}] * 3
+
+
+async def test_off_button_never_merged(hass):
+    """Test an OFF button is posted separately and in order."""
+    posts = []
+
+    async def post(data):
+        posts.append(dict(data))
+        return {}
+
+    buffer = NatureRemoCommandBuffer(hass, post, lambda response: None, 0)
+    await asyncio.gather(
+        buffer.async_submit({"button": "power-off"}),
+        buffer.async_submit({"operation_mode": "cool"}),
+    )
+
+    assert posts == [{"button": "power-off"}, {"operation_mode": "cool"}]
@@ -0,0 +1,40 @@
+"""Test the ECHONET Lite smart meter decoding."""
+from custom_components.nature_remo.echonet import (
+    EPC_CUMULATIVE_ENERGY, EPC_INSTANT_POWER, CumulativeEnergy, meter_profile,
+    meter_profile_of, meter_values,
+)
+from custom_components.nature_remo.models import Appliance
+
+from .fake_cloud import make_device, make_smart_meter
+
+
+def test_meter_values_and_profile():
+    """Test properties decode to a shared profile and kWh readings."""
+    meter = Appliance.from_dict(make_smart_meter(make_device(0), 0))
+    values = meter_values(meter.echonet)
+    profile = meter_profile_of(values)
+
+    assert values[EPC_INSTANT_POWER] == 550
+    assert profile is meter_profile(1, 0x01, 6)
+    assert (profile.multiplier, profile.decimals, profile.rollover) == (0.1, 1, 1000000)
+    assert profile.energy(values[EPC_CUMULATIVE_ENERGY]) == 12345.6
+
+
+def test_cumulative_energy_rollover():
+    """Test the total keeps increasing when the counter wraps around."""
+    profile = meter_profile(1, 0x01, 6)
+    energy = CumulativeEnergy()
+
+    assert energy.update(profile, 999990) == 99999.0
+    assert energy.update(profile, 5) == 100000.5
+    assert energy.offset == 100000.0
+    # Small drops are meter resets, not rollovers
+    assert energy.update(profile, 1) == 100000.1
+
+
+def test_cumulative_energy_restored():
+    """Test a rollover while stopped is detected from the restored reading."""
+    profile = meter_profile(1, 0x00, 5)
+    energy = CumulativeEnergy(offset=0.0, last_raw=99000)
+
+    assert energy.update(profile, 100) == 100100
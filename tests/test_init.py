@@ -1,9 +1,196 @@
 """Test component setup."""
+from datetime import timedelta
+from unittest.mock import patch
+
+from homeassistant.const import (
+    CONF_ACCESS_TOKEN,
+    CONF_DEVICE_ID,
+    CONF_DEVICES,
+    CONF_ENTITIES,
+    EVENT_HOMEASSISTANT_CLOSE,
+)
 from homeassistant.setup import async_setup_component
+import pytest
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.nature_remo import (
+    async_get_coordinator,
+    async_get_registry,
+    async_migrate_entry,
+)
+from custom_components.nature_remo.const import (
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+)
 
-from custom_components.nature_remo.const import DOMAIN
+from .fake_cloud import FakeNatureCloud, async_setup_account, make_aircon, make_device
 
 
 async def test_async_setup(hass):
     """Test the component gets setup."""
     assert await async_setup_component(hass, DOMAIN, {}) is True
+
+
+async def test_migrate_v1_entry(hass):
+    """Test version 1 entries drop the stored devices and appliances."""
+    device = make_device(0)
+    aircon = make_aircon(device, 0)
+    entry = MockConfigEntry(
+        domain=DOMAIN, version=1,
+        data={
+            CONF_ACCESS_TOKEN: "token",
+            CONF_DEVICE_ID: device["id"],
+            CONF_DEVICES: {device["id"]: device},
+            CONF_ENTITIES: {aircon["id"]: aircon},
+        },
+    )
+    entry.add_to_hass(hass)
+
+    assert await async_migrate_entry(hass, entry) is True
+    assert entry.version == 2
+    assert entry.data == {CONF_ACCESS_TOKEN: "token", CONF_DEVICE_ID: "device-0"}
+
+
+async def test_coordinator_shared_per_token(hass):
+    """Test entries with the same token share one coordinator."""
+    first = MockConfigEntry(domain=DOMAIN, data={CONF_ACCESS_TOKEN: "token", CONF_DEVICE_ID: "a"})
+    second = MockConfigEntry(domain=DOMAIN, data={CONF_ACCESS_TOKEN: "token", CONF_DEVICE_ID: "b"})
+    other = MockConfigEntry(domain=DOMAIN, data={CONF_ACCESS_TOKEN: "other", CONF_DEVICE_ID: "c"})
+
+    registry = async_get_registry(hass)
+    coordinator = registry.async_acquire(first)
+
+    assert registry.async_acquire(second) is coordinator
+    assert registry.async_acquire(other) is not coordinator
+
+    await registry.async_release(first)
+    assert registry.get("token") is coordinator
+
+    await registry.async_release(second)
+    with pytest.raises(KeyError):
+        registry.get("token")
+
+
+async def test_unload_first_entry_keeps_polling(hass, aiohttp_server):
+    """Test unloading the entry that created the coordinator keeps it polling."""
+    cloud = FakeNatureCloud(devices=2)
+    server = await aiohttp_server(cloud.app)
+    first, second = await async_setup_account(hass, server, 2)
+    coordinator = async_get_coordinator(hass, second)
+
+    assert await hass.config_entries.async_unload(first.entry_id)
+    await hass.async_block_till_done()
+    assert async_get_coordinator(hass, second) is coordinator
+
+    polls = cloud.requests["/1/devices"]
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(hours=1))
+    await hass.async_block_till_done()
+    assert cloud.requests["/1/devices"] > polls
+    assert coordinator.last_update_success
+
+
+async def test_polls_reuse_connections(hass, aiohttp_server):
+    """Test polls reuse kept-alive connections and unload closes the session."""
+    cloud = FakeNatureCloud()
+    server = await aiohttp_server(cloud.app)
+    entry, = await async_setup_account(hass, server, 1)
+    coordinator = async_get_coordinator(hass, entry)
+    session = coordinator.api.session
+
+    for _ in range(5):
+        await coordinator.async_refresh()
+
+    connections = coordinator.api.connections
+    # Devices and appliances are fetched in parallel on the first poll
+    assert connections.new_connections <= 2
+    assert connections.reused_connections >= 5
+    assert connections.tls_handshakes == 0
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    assert session.closed
+
+
+async def test_session_closed_on_stop(hass, aiohttp_server):
+    """Test the cloud session is closed when Home Assistant stops."""
+    cloud = FakeNatureCloud()
+    server = await aiohttp_server(cloud.app)
+    entry, = await async_setup_account(hass, server, 1)
+    session = async_get_coordinator(hass, entry).api.session
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+    await hass.async_block_till_done()
+    assert session.closed
+
+
+async def test_skipped_poll_after_failure_stays_failed(hass, aiohttp_server):
+    """Test a poll skipped for budget does not hide a failed update."""
+    cloud = FakeNatureCloud()
+    server = await aiohttp_server(cloud.app)
+    entry, = await async_setup_account(hass, server, 1)
+    coordinator = async_get_coordinator(hass, entry)
+
+    # The devices GET and its retries
+    cloud.failing = 3
+    with patch("custom_components.nature_remo.RETRY_BACKOFF", 0):
+        await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+
+    coordinator.api.rate_limiter.remaining = 0
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+
+
+async def _async_setup_coordinator(hass, aiohttp_server, cloud):
+    server = await aiohttp_server(cloud.app)
+    entry, = await async_setup_account(hass, server, 1)
+    coordinator = async_get_coordinator(hass, entry)
+    assert coordinator.update_interval == DEFAULT_SCAN_INTERVAL
+    return coordinator
+
+
+async def test_interval_backs_off_while_stable(hass, aiohttp_server):
+    """Test stable readings double the interval up to the maximum."""
+    cloud = FakeNatureCloud(limit=100000)
+    coordinator = await _async_setup_coordinator(hass, aiohttp_server, cloud)
+
+    intervals = []
+    for _ in range(4):
+        await coordinator.async_refresh()
+        intervals.append(coordinator.update_interval)
+    assert intervals == [
+        DEFAULT_SCAN_INTERVAL * 2, DEFAULT_SCAN_INTERVAL * 4,
+        DEFAULT_MAX_INTERVAL, DEFAULT_MAX_INTERVAL,
+    ]
+
+    cloud.touch()
+    await coordinator.async_refresh()
+    assert coordinator.update_interval == DEFAULT_SCAN_INTERVAL
+
+
+async def test_interval_boosted_after_post(hass, aiohttp_server):
+    """Test a command moves polling to the minimum interval."""
+    cloud = FakeNatureCloud(limit=100000)
+    coordinator = await _async_setup_coordinator(hass, aiohttp_server, cloud)
+
+    await coordinator.async_post("/appliances/aircon-0/aircon_settings", {"temperature": "27"})
+    assert coordinator.update_interval == DEFAULT_MIN_INTERVAL
+
+    # Stable readings do not end the boost
+    await coordinator.async_refresh()
+    assert coordinator.update_interval == DEFAULT_MIN_INTERVAL
+
+
+async def test_interval_boosted_by_motion(hass, aiohttp_server):
+    """Test a new motion event moves polling to the minimum interval."""
+    cloud = FakeNatureCloud(limit=100000)
+    coordinator = await _async_setup_coordinator(hass, aiohttp_server, cloud)
+
+    cloud.devices[0]["newest_events"]["mo"]["created_at"] = dt_util.utcnow().isoformat()
+    await coordinator.async_refresh()
+    assert coordinator.update_interval == DEFAULT_MIN_INTERVAL
@@ -0,0 +1,28 @@
+"""Test the Nature Remo lights."""
+from homeassistant.components.light import DOMAIN as LIGHT_DOMAIN
+from homeassistant.const import ATTR_ENTITY_ID, SERVICE_TURN_OFF, SERVICE_TURN_ON
+
+from .fake_cloud import FakeNatureCloud, async_setup_account, make_light
+
+LIGHT = "light.light_0"
+
+
+async def test_light_follows_cloud_state(hass, aiohttp_server):
+    """Test the light shows the power state returned by the cloud."""
+    cloud = FakeNatureCloud()
+    cloud.appliances.append(make_light(cloud.devices[0], 0))
+    server = await aiohttp_server(cloud.app)
+    await async_setup_account(hass, server, 1)
+
+    assert hass.states.get(LIGHT).state == "on"
+
+    await hass.services.async_call(
+        LIGHT_DOMAIN, SERVICE_TURN_OFF, {ATTR_ENTITY_ID: LIGHT}, blocking=True
+    )
+    assert hass.states.get(LIGHT).state == "off"
+
+    await hass.services.async_call(
+        LIGHT_DOMAIN, SERVICE_TURN_ON, {ATTR_ENTITY_ID: LIGHT}, blocking=True
+    )
+    assert hass.states.get(LIGHT).state == "on"
+    assert cloud.buttons_pressed == [("light-0", "off"), ("light-0", "on")]
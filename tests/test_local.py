@@ -0,0 +1,37 @@
+"""Test sending IR messages over the LAN."""
+import aiohttp
+import pytest
+
+from custom_components.nature_remo import NatureRemoApi, NatureRemoApiError
+from custom_components.nature_remo.local import NatureRemoLocalApi
+
+from .fake_remo import FakeRemo
+
+MESSAGE = {"format": "us", "freq": 38, "data": [900, 450, 60]}
+
+
+async def test_send_message_over_lan(aiohttp_server):
+    """Test raw IR messages are posted to the device."""
+    remo = FakeRemo()
+    server = await aiohttp_server(remo.app)
+
+    async with aiohttp.ClientSession() as session:
+        local = NatureRemoLocalApi(f"{server.host}:{server.port}", session)
+        assert await local.async_get_message() == remo.last_received
+        await local.async_send_message(MESSAGE)
+
+    assert remo.messages == [MESSAGE]
+
+
+async def test_unreachable_device_without_signal(aiohttp_server):
+    """Test an unreachable device without a cloud signal raises."""
+    remo = FakeRemo()
+    server = await aiohttp_server(remo.app)
+    host = f"{server.host}:{server.port}"
+    await server.close()
+
+    async with aiohttp.ClientSession() as session:
+        api = NatureRemoApi("http://cloud.invalid", "token", session)
+        api.set_local_host("device", host)
+        with pytest.raises(NatureRemoApiError):
+            await api.send_ir("device", message=MESSAGE)
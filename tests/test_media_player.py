@@ -0,0 +1,35 @@
+"""Test the Nature Remo TVs."""
+from homeassistant.components.media_player import DOMAIN as MEDIA_PLAYER_DOMAIN
+from homeassistant.const import (
+    ATTR_ENTITY_ID, SERVICE_TURN_OFF, SERVICE_TURN_ON, SERVICE_VOLUME_UP, STATE_UNKNOWN,
+)
+
+from .fake_cloud import FakeNatureCloud, async_setup_account, make_tv
+
+TV = "media_player.tv_0"
+
+
+async def _async_call(hass, service):
+    await hass.services.async_call(
+        MEDIA_PLAYER_DOMAIN, service, {ATTR_ENTITY_ID: TV}, blocking=True
+    )
+
+
+async def test_tv_assumes_power_state(hass, aiohttp_server):
+    """Test the TV state follows the power commands sent."""
+    cloud = FakeNatureCloud()
+    cloud.appliances.append(make_tv(cloud.devices[0], 0))
+    server = await aiohttp_server(cloud.app)
+    await async_setup_account(hass, server, 1)
+
+    state = hass.states.get(TV)
+    assert state.state == STATE_UNKNOWN
+    assert state.attributes["source"] == "t"
+
+    await _async_call(hass, SERVICE_TURN_ON)
+    assert hass.states.get(TV).state == "on"
+    await _async_call(hass, SERVICE_VOLUME_UP)
+    await _async_call(hass, SERVICE_TURN_OFF)
+    assert hass.states.get(TV).state == "off"
+
+    assert cloud.buttons_pressed == [("tv-0", "power"), ("tv-0", "vol-up"), ("tv-0", "power")]
@@ -0,0 +1,110 @@
+"""Test the compact appliance records."""
+import json
+import time
+import tracemalloc
+from unittest.mock import patch
+
+from custom_components.nature_remo import models
+from custom_components.nature_remo.models import Appliance, decode_appliances
+
+from .fake_cloud import make_aircon, make_device, make_light, make_smart_meter, make_tv
+
+APPLIANCES = 300
+
+
+def _large_account():
+    appliances = []
+    for index in range(APPLIANCES):
+        appliance = make_aircon(make_device(index), index)
+        # Learned signals dominate real payloads
+        appliance["signals"] *= 10
+        appliances.append(appliance)
+    return appliances, json.dumps(appliances).encode()
+
+
+def _measure(decode, body):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = decode(body)
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, size
+
+
+def test_decode_projects_fields():
+    """Test decoding keeps only the fields platforms use."""
+    appliances, body = _large_account()
+    records = decode_appliances(body)
+
+    assert records == tuple(Appliance.from_dict(item) for item in appliances)
+    assert Appliance.from_dict(records[0].as_dict()) == records[0]
+    assert records[0].settings.mode == "cool"
+    assert dict(records[0].modes)["cool"].temp[0] == "16"
+
+
+def test_decode_appliance_types():
+    """Test TVs, lights, IR signals and smart meters survive decoding."""
+    device = make_device(0)
+    appliances = [make_tv(device, 0), make_light(device, 0), make_smart_meter(device, 0)]
+    records = decode_appliances(json.dumps(appliances).encode())
+    tv, light, meter = records
+
+    assert records == tuple(Appliance.from_dict(item) for item in appliances)
+    for record in records:
+        assert Appliance.from_dict(record.as_dict()) == record
+    assert tv.tv.input == "t"
+    assert tv.signals[0].id == "tv-signal-0"
+    assert [button.name for button in tv.buttons][:2] == ["power", "vol-up"]
+    assert light.light.power == "on"
+    assert {prop.epc: prop.val for prop in meter.echonet}[231] == "550"
+
+
+def test_decode_without_msgspec():
+    """Test the JSON fallback decodes the same records as msgspec."""
+    device = make_device(0)
+    appliances = [
+        make_aircon(device, 0), make_tv(device, 0), make_light(device, 0),
+        make_smart_meter(device, 0),
+    ]
+    body = json.dumps(appliances).encode()
+    assert models.msgspec is not None
+
+    with patch.object(models, "msgspec", None):
+        fallback = decode_appliances(body)
+
+    assert fallback == decode_appliances(body)
+    assert fallback == tuple(Appliance.from_dict(item) for item in appliances)
+
+
+def test_decode_memory_and_time(benchmark):
+    """Compare full JSON decoding with the projected records."""
+    _, body = _large_account()
+
+    _, full_time, full_size = _measure(json.loads, body)
+    _, compact_time, compact_size = _measure(decode_appliances, body)
+
+    benchmark.extra_info.update({
+        "body_bytes": len(body),
+        "full_decode_ms": full_time * 1000,
+        "full_memory_bytes": full_size,
+        "compact_decode_ms": compact_time * 1000,
+        "compact_memory_bytes": compact_size,
+    })
+    assert compact_size < full_size
+
+    benchmark(decode_appliances, body)
+
+
+def test_aircon_capabilities_shared_per_range():
+    """Test capabilities are computed once and shared by identical ranges."""
+    from custom_components.nature_remo.climate import aircon_capabilities
+
+    first = Appliance.from_dict(make_aircon(make_device(0), 0))
+    second = Appliance.from_dict(make_aircon(make_device(1), 1))
+    capabilities = aircon_capabilities(first.modes)
+
+    assert aircon_capabilities(second.modes) is capabilities
+    cool = capabilities.per_mode["cool"]
+    assert (cool.min_temp, cool.max_temp, cool.step) == (16.0, 30.0, 1.0)
+    assert cool.fan_modes == ["auto", "1", "2", "3"]
@@ -0,0 +1,49 @@
+"""Test the cloud API rate limiter."""
+import asyncio
+from datetime import timedelta
+import time
+
+from custom_components.nature_remo.rate_limit import (
+    PRIORITY_COMMAND,
+    PRIORITY_POLL,
+    NatureRemoRateLimiter,
+)
+
+
+async def test_polls_skipped_when_budget_low():
+    """Test polls are refused once only the command reserve is left."""
+    limiter = NatureRemoRateLimiter(reserve=5)
+    limiter.update({
+        "X-Rate-Limit-Limit": "30",
+        "X-Rate-Limit-Remaining": "6",
+        "X-Rate-Limit-Reset": str(time.time() + 60),
+    })
+
+    assert await limiter.async_acquire(PRIORITY_POLL) is True
+    assert await limiter.async_acquire(PRIORITY_POLL) is False
+    assert await limiter.async_acquire(PRIORITY_COMMAND) is True
+    assert limiter.remaining == 4
+
+
+async def test_stretch_interval():
+    """Test the poll interval grows to fit the remaining budget."""
+    limiter = NatureRemoRateLimiter(reserve=5)
+    base = timedelta(seconds=60)
+    assert limiter.stretch_interval(base) == base
+
+    limiter.update({"X-Rate-Limit-Remaining": "9", "X-Rate-Limit-Reset": str(time.time() + 200)})
+    assert limiter.stretch_interval(base, requests_per_poll=2) > timedelta(seconds=90)
+
+
+async def test_window_starts_without_reset_header():
+    """Test tokens spent without any response come back after the window."""
+    limiter = NatureRemoRateLimiter(limit=8, window=0.05, reserve=5)
+
+    for _ in range(3):
+        assert await limiter.async_acquire(PRIORITY_POLL) is True
+    assert await limiter.async_acquire(PRIORITY_POLL) is False
+    assert limiter.reset is not None
+
+    await asyncio.sleep(0.1)
+    assert await limiter.async_acquire(PRIORITY_POLL) is True
+    assert limiter.remaining == 7
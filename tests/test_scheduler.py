@@ -0,0 +1,61 @@
+"""Test the multi-account poll scheduler."""
+from datetime import timedelta
+import time
+from unittest.mock import patch
+
+from custom_components.nature_remo.scheduler import NatureRemoPollScheduler
+
+INTERVAL = timedelta(seconds=60)
+POLL_DURATION = 2.5
+
+
+def test_accounts_spread_over_interval():
+    """Test accounts are given evenly spaced slots."""
+    scheduler = NatureRemoPollScheduler()
+    for account in ("a", "b", "c"):
+        scheduler.add(account)
+
+    assert [scheduler.phase(account, 60) for account in ("a", "b", "c")] == [0, 20, 40]
+
+    now = time.monotonic()
+    slots = sorted(
+        (now + scheduler.align(account, INTERVAL).total_seconds()) % 60
+        for account in ("a", "b", "c")
+    )
+    assert round(slots[1] - slots[0]) == 20
+    assert round(slots[2] - slots[1]) == 20
+
+    for account in ("a", "b", "c"):
+        delay = scheduler.align(account, INTERVAL)
+        assert INTERVAL / 2 <= delay < INTERVAL * 1.5
+
+
+def test_consecutive_polls_one_interval_apart():
+    """Test polls that take time keep landing on consecutive slots."""
+    clock = [1000.0]
+    with patch("custom_components.nature_remo.scheduler.time.monotonic",
+               side_effect=lambda: clock[0]):
+        scheduler = NatureRemoPollScheduler()
+        for account in ("a", "b", "c"):
+            scheduler.add(account)
+
+        starts = []
+        clock[0] += 7
+        for _ in range(10):
+            clock[0] += scheduler.align("b", INTERVAL).total_seconds()
+            starts.append(clock[0])
+            clock[0] += POLL_DURATION
+
+    assert [round(start - 1000) % 60 for start in starts] == [20] * 10
+    assert [round(b - a) for a, b in zip(starts, starts[1:])] == [60] * 9
+
+
+def test_single_account_not_shifted():
+    """Test a single account keeps its interval."""
+    scheduler = NatureRemoPollScheduler()
+    scheduler.add("a")
+    assert scheduler.align("a", INTERVAL) == INTERVAL
+
+    scheduler.add("b")
+    scheduler.remove("b")
+    assert scheduler.phase("b", 60) == 0
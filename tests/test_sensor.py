@@ -0,0 +1,90 @@
+"""Test the Nature Remo sensors."""
+from datetime import timedelta
+
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.nature_remo import async_get_coordinator
+
+from .fake_cloud import FakeNatureCloud, async_setup_account
+
+MOTION = "sensor.remo_0_motion_sensor"
+ILLUMINATION = "sensor.remo_0_illumination_sensor"
+
+
+async def test_motion_clears_after_timeout(hass, aiohttp_server):
+    """Test motion turns on for new events and clears at the timeout."""
+    cloud = FakeNatureCloud()
+    now = dt_util.utcnow()
+    cloud.devices[0]["newest_events"]["mo"]["created_at"] = now.isoformat()
+    server = await aiohttp_server(cloud.app)
+    await async_setup_account(hass, server, 1)
+
+    assert hass.states.get(MOTION).state == "on"
+
+    async_fire_time_changed(hass, now + timedelta(seconds=59))
+    await hass.async_block_till_done()
+    assert hass.states.get(MOTION).state == "on"
+
+    async_fire_time_changed(hass, now + timedelta(seconds=61))
+    await hass.async_block_till_done()
+    assert hass.states.get(MOTION).state == "off"
+
+
+async def test_motion_old_event_is_off(hass, aiohttp_server):
+    """Test an event older than a day is not reported as motion."""
+    cloud = FakeNatureCloud()
+    created_at = dt_util.utcnow() - timedelta(days=1, seconds=10)
+    cloud.devices[0]["newest_events"]["mo"]["created_at"] = created_at.isoformat()
+    server = await aiohttp_server(cloud.app)
+    await async_setup_account(hass, server, 1)
+
+    assert hass.states.get(MOTION).state == "off"
+
+
+async def test_illumination_deadband(hass, aiohttp_server):
+    """Test illumination jitter within the deadband is not written."""
+    cloud = FakeNatureCloud()
+    server = await aiohttp_server(cloud.app)
+    entry, = await async_setup_account(hass, server, 1)
+    coordinator = async_get_coordinator(hass, entry)
+    event = cloud.devices[0]["newest_events"]["il"]
+
+    event["val"] = 125
+    await coordinator.async_refresh()
+    assert hass.states.get(ILLUMINATION).state == "120"
+    assert coordinator.metrics.suppressed_writes == 1
+
+    event["val"] = 135
+    await coordinator.async_refresh()
+    assert hass.states.get(ILLUMINATION).state == "135"
+    assert coordinator.metrics.suppressed_writes == 1
+
+
+async def test_removed_device_unavailable(hass, aiohttp_server):
+    """Test sensors of a Remo removed from the account become unavailable."""
+    cloud = FakeNatureCloud()
+    server = await aiohttp_server(cloud.app)
+    entry, = await async_setup_account(hass, server, 1)
+    coordinator = async_get_coordinator(hass, entry)
+
+    cloud.devices.clear()
+    await coordinator.async_refresh()
+
+    assert hass.states.get(ILLUMINATION).state == STATE_UNAVAILABLE
+    assert hass.states.get(MOTION).state == STATE_UNAVAILABLE
+
+
+async def test_metric_sensors_once_per_account(hass, aiohttp_server):
+    """Test the metric sensors of an account are added by one entry only."""
+    cloud = FakeNatureCloud(devices=2)
+    server = await aiohttp_server(cloud.app)
+    await async_setup_account(hass, server, 2)
+
+    unique_ids = [
+        entity.unique_id for entity in er.async_get(hass).entities.values()
+        if entity.unique_id.endswith("-rate_limit_remaining")
+    ]
+    assert unique_ids == ["device-0-rate_limit_remaining"]
@@ -0,0 +1,124 @@
+"""Test the Nature Remo services."""
+import asyncio
+
+from homeassistant.components.button import DOMAIN as BUTTON_DOMAIN, SERVICE_PRESS
+from homeassistant.const import ATTR_ENTITY_ID, CONF_HOST
+from homeassistant.exceptions import HomeAssistantError
+import pytest
+
+from custom_components.nature_remo.const import DOMAIN
+from custom_components.nature_remo.services import SERVICE_SEND_SIGNALS
+
+from .fake_cloud import FakeNatureCloud, async_setup_account, make_tv
+from .fake_remo import FakeRemo
+
+MESSAGE = {"format": "us", "freq": 38, "data": [900, 450, 60]}
+
+
+async def _async_send_signals(hass, commands):
+    return await hass.services.async_call(
+        DOMAIN, SERVICE_SEND_SIGNALS, {"commands": commands},
+        blocking=True, return_response=True,
+    )
+
+
+async def test_send_signals(hass, aiohttp_server):
+    """Test a batch returns one result per command in order."""
+    cloud = FakeNatureCloud(devices=2, delay=0.05)
+    server = await aiohttp_server(cloud.app)
+    await async_setup_account(hass, server, 2)
+
+    response = await _async_send_signals(hass, [
+        {"appliance": "aircon-0", "signal": "signal-0-0"},
+        {"appliance": "aircon-1", "signal": "Signal 1"},
+        {"appliance": "aircon-0", "signal": "signal-0-2"},
+        {"appliance": "missing", "signal": "signal-0-0"},
+        {"appliance": "aircon-0", "button": "power"},
+    ])
+
+    assert [result["success"] for result in response["results"]] == [
+        True, True, True, False, False,
+    ]
+    assert response["results"][3]["error"] == "Unknown appliance missing"
+    # Signals of one device are sent in order
+    sent = [signal for signal in cloud.signals_sent if signal.startswith("signal-0")]
+    assert sent == ["signal-0-0", "signal-0-2"]
+    assert "signal-1-1" in cloud.signals_sent
+
+
+async def test_send_signals_over_budget(hass, aiohttp_server):
+    """Test a batch larger than the remaining budget is not sent."""
+    cloud = FakeNatureCloud()
+    server = await aiohttp_server(cloud.app)
+    await async_setup_account(hass, server, 1)
+
+    with pytest.raises(HomeAssistantError):
+        await _async_send_signals(hass, [
+            {"appliance": "aircon-0", "signal": "signal-0-0"},
+        ] * 40)
+    assert cloud.signals_sent == []
+
+
+async def _async_setup_with_remo(hass, aiohttp_server, cloud, remo):
+    server = await aiohttp_server(cloud.app)
+    remo_server = await aiohttp_server(remo.app)
+    entry, = await async_setup_account(hass, server, 1)
+    hass.config_entries.async_update_entry(
+        entry, options={CONF_HOST: f"{remo_server.host}:{remo_server.port}"}
+    )
+    await hass.async_block_till_done()
+
+
+async def test_send_raw_message_over_lan(hass, aiohttp_server):
+    """Test raw messages are blasted by the Remo instead of the cloud signal."""
+    cloud = FakeNatureCloud()
+    remo = FakeRemo()
+    await _async_setup_with_remo(hass, aiohttp_server, cloud, remo)
+
+    response = await _async_send_signals(hass, [
+        {"appliance": "aircon-0", "signal": "signal-0-0", "message": MESSAGE},
+    ])
+
+    assert response["results"][0]["success"] is True
+    assert remo.messages == [MESSAGE]
+    assert cloud.signals_sent == []
+
+
+async def test_lan_messages_not_counted_in_budget(hass, aiohttp_server):
+    """Test messages blasted over the LAN do not use the cloud budget."""
+    cloud = FakeNatureCloud()
+    remo = FakeRemo()
+    await _async_setup_with_remo(hass, aiohttp_server, cloud, remo)
+
+    response = await _async_send_signals(hass, [
+        {"appliance": "aircon-0", "signal": "signal-0-0", "message": MESSAGE},
+    ] * 40)
+
+    assert all(result["success"] for result in response["results"])
+    assert len(remo.messages) == 40
+    assert cloud.signals_sent == []
+
+
+async def test_presses_wait_for_batch(hass, aiohttp_server):
+    """Test button presses are not blasted by a Remo while it sends a batch."""
+    cloud = FakeNatureCloud(delay=0.05)
+    cloud.appliances.append(make_tv(cloud.devices[0], 0))
+    server = await aiohttp_server(cloud.app)
+    await async_setup_account(hass, server, 1)
+
+    await asyncio.gather(
+        _async_send_signals(hass, [
+            {"appliance": "aircon-0", "signal": "signal-0-0"},
+            {"appliance": "tv-0", "button": "mute"},
+        ]),
+        *(
+            hass.services.async_call(
+                BUTTON_DOMAIN, SERVICE_PRESS, {ATTR_ENTITY_ID: entity_id}, blocking=True
+            )
+            for entity_id in ("button.aircon_0_signal_1", "button.tv_0_power")
+        ),
+    )
+
+    assert len(cloud.signals_sent) == 2
+    assert len(cloud.buttons_pressed) == 2
+    assert cloud.max_posts_in_flight == 1
@@ -0,0 +1,136 @@
+"""Measure import and startup time with and without the cached snapshot."""
+import hashlib
+import re
+import subprocess
+import sys
+import time
+from unittest.mock import patch
+
+from homeassistant.const import CONF_ACCESS_TOKEN, CONF_DEVICE_ID, STATE_UNAVAILABLE
+from homeassistant.helpers.entity_platform import async_get_platforms
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.nature_remo import _compact_snapshot
+from custom_components.nature_remo.const import DOMAIN, STORAGE_VERSION
+from custom_components.nature_remo.models import Appliance
+
+from .fake_cloud import FakeNatureCloud
+
+DEVICES = 10
+DELAY = 1.0
+TEMPERATURE = "sensor.remo_0_temperature_sensor"
+
+
+async def _async_setup(hass, aiohttp_server, cloud):
+    """Set up one entry, return the setup time and the state it started with."""
+    server = await aiohttp_server(cloud.app)
+    entry = MockConfigEntry(
+        domain=DOMAIN, version=2,
+        data={CONF_ACCESS_TOKEN: "token", CONF_DEVICE_ID: "device-0"},
+    )
+    entry.add_to_hass(hass)
+
+    with patch("custom_components.nature_remo.BASE_URL", str(server.make_url("/1"))):
+        start = time.perf_counter()
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        elapsed = time.perf_counter() - start
+        initial = hass.states.get(TEMPERATURE)
+        await hass.async_block_till_done()
+    return elapsed, initial
+
+
+def _seed_snapshot(hass_storage, cloud):
+    """Store the snapshot of the fake cloud account."""
+    key = hashlib.sha256(b"token").hexdigest()[:16]
+    hass_storage[f"{DOMAIN}.{key}"] = {
+        "version": STORAGE_VERSION,
+        "key": f"{DOMAIN}.{key}",
+        "data": _compact_snapshot({
+            "devices": {device["id"]: device for device in cloud.devices},
+            "entities": {
+                appliance["id"]: Appliance.from_dict(appliance)
+                for appliance in cloud.appliances
+            },
+        }),
+    }
+
+
+async def test_startup_time_cold(hass, aiohttp_server):
+    """Test startup without a snapshot waits for the cloud."""
+    cloud = FakeNatureCloud(devices=DEVICES, delay=DELAY)
+    elapsed, initial = await _async_setup(hass, aiohttp_server, cloud)
+    assert elapsed >= DELAY
+    assert "restored_stale" not in initial.attributes
+
+
+async def test_startup_time_from_snapshot(hass, aiohttp_server, hass_storage):
+    """Test startup from a snapshot does not wait for the cloud."""
+    cloud = FakeNatureCloud(devices=DEVICES, delay=DELAY)
+    _seed_snapshot(hass_storage, cloud)
+
+    elapsed, initial = await _async_setup(hass, aiohttp_server, cloud)
+    assert elapsed < DELAY
+
+    # Entities start from the snapshot, flagged until the cloud answered
+    assert initial.attributes["restored_stale"] is True
+    state = hass.states.get(TEMPERATURE)
+    assert "restored_stale" not in state.attributes
+
+
+async def test_snapshot_available_while_cloud_down(hass, aiohttp_server, hass_storage):
+    """Test restored entities stay available until the cloud answered once."""
+    cloud = FakeNatureCloud(devices=DEVICES)
+    cloud.failing = 100
+    _seed_snapshot(hass_storage, cloud)
+
+    with patch("custom_components.nature_remo.RETRY_BACKOFF", 0):
+        await _async_setup(hass, aiohttp_server, cloud)
+
+    state = hass.states.get(TEMPERATURE)
+    assert state.state != STATE_UNAVAILABLE
+    assert state.attributes["restored_stale"] is True
+
+
+def _import_times():
+    """Import the integration in a fresh interpreter, return the module import times."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import custom_components.nature_remo"],
+        capture_output=True, text=True, check=True,
+    )
+    # "import time: self [us] | cumulative | imported package" per module
+    return {
+        match.group(3).strip(): int(match.group(2))
+        for match in re.finditer(r"import time:\s+(\d+) \|\s+(\d+) \|(.*)", result.stderr)
+    }
+
+
+def test_import_time(benchmark):
+    """Measure the import time of the integration in a fresh interpreter."""
+    times = benchmark.pedantic(_import_times, rounds=3, iterations=1)
+    benchmark.extra_info["import_ms"] = times["custom_components.nature_remo"] / 1000
+    # Platforms are imported when an entry is forwarded to them
+    assert "custom_components.nature_remo.climate" not in times
+    assert not any(module.startswith("dateutil") for module in times)
+
+
+async def test_forward_only_used_platforms(hass, aiohttp_server):
+    """Test entries are only forwarded to platforms with entities."""
+    cloud = FakeNatureCloud(devices=2)
+    # The second device has no appliances
+    cloud.appliances = cloud.appliances[:1]
+    await _async_setup(hass, aiohttp_server, cloud)
+    entry = MockConfigEntry(
+        domain=DOMAIN, version=2,
+        data={CONF_ACCESS_TOKEN: "token", CONF_DEVICE_ID: "device-1"},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    loaded = {}
+    for platform in async_get_platforms(hass, DOMAIN):
+        loaded.setdefault(platform.config_entry.data[CONF_DEVICE_ID], set()).add(platform.domain)
+    assert loaded == {
+        "device-0": {"sensor", "climate", "button"},
+        "device-1": {"sensor"},
+    }